@@ -0,0 +1,275 @@
+"""Monte Carlo tree search advisor for story choices and combat actions
+
+The advisor plays the game forward from the current state thousands of
+times, through story choices, conditional branches and the combat dice, and
+recommends the option with the best chance of reaching a goal ending (any
+successful ending by default).
+
+Search nodes are stored in a table keyed by GameState.key() plus the enemy's
+HP, so the same situation reached by different routes shares its statistics
+and everything learned for one decision is still there for the next. With
+several workers each process searches its own table (root parallelism) and
+the visit counts for the current choices are added up; the tables live as
+long as the pool, so reuse carries across turns in every worker.
+
+    python advisor.py --goal explorer_ending --budget 0.1
+    python advisor.py --games 50 --workers 4 --quiet
+"""
+import argparse
+import math
+import os
+import random
+import time
+from collections import namedtuple
+from multiprocessing import Pool
+
+from bundle import story
+from combat_solver import solve
+from engine import Engine
+from state import GameState
+
+ACTIONS = [action for action, icon in story.COMBAT_ACTIONS]
+EXPLORATION = math.sqrt(2)
+MAX_DEPTH = 200
+MAX_NODES = 500000
+
+Advice = namedtuple("Advice", "choice label value options iterations")
+
+
+class Node:
+    """Visit counts and total reward for each option of one decision state"""
+    __slots__ = ("visits", "counts", "totals")
+
+    def __init__(self, options):
+        self.visits = 0
+        self.counts = [0] * options
+        self.totals = [0.0] * options
+
+
+def options(scene):
+    """Labels of what can be chosen at a decision scene"""
+    if scene.combat:
+        return ACTIONS
+    return [choice.label for choice in scene.choices]
+
+
+class Search:
+    """Single-threaded MCTS over one engine, keeping its node table between calls"""
+
+    def __init__(self, engine, goal=None, seed=None):
+        self.engine = engine
+        self.goal = goal
+        self.rng = random.Random(seed)
+        self.table = {}
+        for scene in engine.scenes:
+            if scene.combat:
+                solve(scene.combat)  # solve fights up front so rollouts never pay for it
+
+    def reward(self, scene):
+        if self.goal is None:
+            return 1.0 if scene.ending else 0.0
+        return 1.0 if scene.id == self.goal else 0.0
+
+    def enter(self, state, scene):
+        """Apply scenes from `scene` on until one needs a decision or ends the game"""
+        engine = self.engine
+        while True:
+            state.scene = scene.id
+            engine.apply(scene, state)
+            if scene.ending is not None or scene.choices:
+                return scene, 0
+            if scene.combat:
+                return scene, scene.combat.hp
+            scene = engine.follow(scene, state)
+
+    def step(self, state, scene, enemy_hp, option):
+        """Take a 0-based option at a decision scene; returns the next (scene, enemy_hp)"""
+        engine = self.engine
+        if scene.combat:
+            fight = scene.combat
+            enemy_hp, messages = engine.combat_turn(fight, state, enemy_hp, ACTIONS[option], self.rng)
+            result = engine.combat_result(fight, state, enemy_hp)
+            if result is None:
+                return scene, enemy_hp
+            return self.enter(state, result)
+        return self.enter(state, engine.follow(scene, state, option + 1))
+
+    def iterate(self, snapshot, scene, enemy_hp):
+        """One selection / expansion / rollout / backup pass from the root"""
+        rng, table = self.rng, self.table
+        state = GameState.from_snapshot(snapshot)
+        path = []
+        expanded = False
+        for _ in range(MAX_DEPTH):
+            if scene.ending is not None:
+                break
+            count = len(options(scene))
+            key = (state.key(), enemy_hp)
+            node = table.get(key)
+            if node is None:
+                if expanded:  # past the tree: roll out
+                    scene, enemy_hp = self.step(state, scene, enemy_hp, self.rollout(state, scene, enemy_hp, count))
+                    continue
+                node = table[key] = Node(count)
+                expanded = True
+            # A fresh node follows the default policy first, so thinly visited corners of the
+            # tree (most combat HP pairs) are valued by sensible play rather than by blunders
+            option = self.rollout(state, scene, enemy_hp, count) if node.visits == 0 else self.select(node)
+            path.append((node, option))
+            scene, enemy_hp = self.step(state, scene, enemy_hp, option)
+        reward = self.reward(scene) if scene.ending is not None else 0.0
+        for node, option in path:
+            node.visits += 1
+            node.counts[option] += 1
+            node.totals[option] += reward
+
+    def rollout(self, state, scene, enemy_hp, count):
+        """Default policy: random story choices, fights played by the exact combat solver"""
+        if scene.combat:
+            return ACTIONS.index(solve(scene.combat, state.max_hp).best_action(state.hp, enemy_hp))
+        return self.rng.randrange(count)
+
+    def select(self, node):
+        """UCB1, trying every option once first"""
+        untried = [i for i, n in enumerate(node.counts) if n == 0]
+        if untried:
+            return self.rng.choice(untried)
+        scale = EXPLORATION * math.sqrt(math.log(node.visits))
+        return max(range(len(node.counts)),
+                   key=lambda i: node.totals[i] / node.counts[i] + scale / math.sqrt(node.counts[i]))
+
+    def run(self, snapshot, scene_id, enemy_hp, deadline):
+        """Search until time.monotonic() reaches `deadline`; returns root (counts, totals, iterations)"""
+        if len(self.table) > MAX_NODES:
+            self.table.clear()
+        engine = self.engine
+        scene = engine.scene(scene_id)
+        iterations = 0
+        # Playouts are not games: keep them out of the engine's telemetry
+        telemetry, engine.telemetry = engine.telemetry, None
+        try:
+            while True:
+                self.iterate(snapshot, scene, enemy_hp)
+                iterations += 1
+                if iterations % 16 == 0 and time.monotonic() >= deadline:
+                    break
+        finally:
+            engine.telemetry = telemetry
+        node = self.table[GameState.from_snapshot(snapshot).key(), enemy_hp]
+        return node.counts, node.totals, iterations
+
+
+_search = None
+
+
+def _init_worker(goal, seed):
+    global _search
+    _search = Search(Engine(), goal, None if seed is None else f"{seed}:{os.getpid()}")
+
+
+def _run(args):
+    return _search.run(*args)
+
+
+class Advisor:
+    """Recommends choices within a per-decision time budget, on a worker pool"""
+
+    def __init__(self, engine=None, goal="explorer_ending", budget=0.1, workers=1, seed=None):
+        self.engine = engine or Engine()
+        self.goal = goal
+        self.budget = budget
+        self.workers = workers or os.cpu_count() or 1
+        self.search = Search(self.engine, goal, seed)
+        self.pool = None
+        # Workers build a plain Engine, so generated scenes (sector maps) are searched in-process
+        if self.workers > 1 and not self.engine.providers:
+            self.pool = Pool(self.workers, initializer=_init_worker, initargs=(goal, seed))
+
+    def advise(self, scene, player, enemy_hp=None):
+        """Best option at a choice scene or combat round, as Advice with a 1-based choice"""
+        if scene.combat and enemy_hp is None:
+            enemy_hp = scene.combat.hp
+        state = player if isinstance(player, GameState) else GameState.from_player(player)
+        snapshot = state.snapshot()._replace(scene=scene.id)
+        # One deadline shared by every worker, leaving time to hand the results back
+        args = (snapshot, scene.id, enemy_hp or 0, time.monotonic() + self.budget * 0.9)
+        if self.pool:
+            parts = self.pool.map(_run, [args] * self.workers)
+        else:
+            parts = [self.search.run(*args)]
+
+        labels = options(scene)
+        counts = [sum(part[0][i] for part in parts) for i in range(len(labels))]
+        totals = [sum(part[1][i] for part in parts) for i in range(len(labels))]
+        iterations = sum(part[2] for part in parts)
+        values = [total / count if count else 0.0 for count, total in zip(counts, totals)]
+        # The most visited option is the most robust pick
+        best = max(range(len(labels)), key=lambda i: (counts[i], values[i]))
+        return Advice(best + 1, labels[best], values[best], list(zip(labels, counts, values)), iterations)
+
+    def close(self):
+        if self.pool:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def autoplay(advisor, rng, verbose=False):
+    """Play one game taking every decision from the advisor; returns (ending ID, decision times)"""
+    engine = advisor.engine
+    state = GameState("Advisor")
+    times = []
+    game = Search(engine)
+    game.rng = rng  # the real game's dice, apart from the search's
+    scene, enemy_hp = game.enter(state, engine.start)
+    while scene.ending is None:
+        start = time.perf_counter()
+        advice = advisor.advise(scene, state, enemy_hp)
+        times.append(time.perf_counter() - start)
+        if verbose:
+            where = f"{scene.id} (enemy {enemy_hp} HP, you {state.hp} HP)" if scene.combat else scene.id
+            print(f"{where}: {advice.label} [{advice.value:.0%} over {advice.iterations} playouts]")
+        scene, enemy_hp = game.step(state, scene, enemy_hp, advice.choice - 1)
+    return scene.id, times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play Starship Odyssey with the MCTS advisor")
+    parser.add_argument("--goal", default="explorer_ending", help="ending to aim for ('any' for any success)")
+    parser.add_argument("--budget", type=float, default=0.1, help="seconds per decision")
+    parser.add_argument("--workers", type=int, default=1, help="search processes (0 = all cores)")
+    parser.add_argument("--games", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args()
+
+    goal = None if args.goal == "any" else args.goal
+    rng = random.Random(args.seed)
+    endings = {}
+    times = []
+    with Advisor(goal=goal, budget=args.budget, workers=args.workers, seed=args.seed) as advisor:
+        for game in range(args.games):
+            ending, decisions = autoplay(advisor, rng, verbose=not args.quiet)
+            endings[ending] = endings.get(ending, 0) + 1
+            times.extend(decisions)
+            if not args.quiet:
+                print(f"-> {ending}\n")
+
+    print(f"\n{'='*50}")
+    print(f"{args.games} games aiming for {args.goal}, {args.budget * 1000:.0f} ms per decision")
+    print(f"{'='*50}")
+    for ending, count in sorted(endings.items(), key=lambda item: -item[1]):
+        print(f"{ending:<20} {count:>6} {count / args.games:>8.2%}")
+    if times:
+        print(f"\nDecision time: mean {sum(times) / len(times) * 1000:.1f} ms | "
+              f"worst {max(times) * 1000:.1f} ms over {len(times)} decisions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Vectorized combat core for running many independent fights at once
+
+Fighter state is kept in NumPy arrays and every round draws its damage rolls
+for all fights in bulk. The rules are the ones in Engine.combat_turn, with
+Player.take_damage and Player.heal clamping HP to [0, max_hp].
+
+    python batch_combat.py -n 10000000 --policy optimal
+"""
+import argparse
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from engine import Engine
+
+ACTIONS = ("attack", "defend", "heal")
+ATTACK, DEFEND, HEAL = range(3)
+MAX_TURNS = 10000
+
+
+class BatchCombat:
+    """N independent fights against the same encounter"""
+
+    def __init__(self, combat, n, player_hp=100, max_hp=100, seed=None):
+        if np is None:
+            raise ImportError("batch_combat needs NumPy: pip install numpy")
+        self.combat = combat
+        self.max_hp = max_hp
+        self.rng = np.random.default_rng(seed)
+        self.player_hp = np.full(n, player_hp, dtype=np.int32)
+        self.enemy_hp = np.full(n, combat.hp, dtype=np.int32)
+        self.turns = np.zeros(n, dtype=np.int32)
+
+    @property
+    def active(self):
+        return (self.enemy_hp > 0) & (self.player_hp > 0)
+
+    @property
+    def won(self):
+        return (self.player_hp > 0) & (self.enemy_hp <= 0)
+
+    @property
+    def lost(self):
+        return self.player_hp <= 0
+
+    def step(self, actions):
+        """Resolve one round for every fight still going; actions is a code or an array of codes"""
+        live = np.flatnonzero(self.active)
+        if live.size == 0:
+            return 0
+
+        fight = self.combat
+        rng = self.rng
+        actions = np.broadcast_to(np.asarray(actions), self.player_hp.shape)[live]
+        player = self.player_hp[live]
+        enemy = self.enemy_hp[live]
+
+        attack = rng.integers(fight.attack[0], fight.attack[1] + 1, size=live.size, dtype=np.int32)
+        strike = rng.integers(fight.strike[0], fight.strike[1] + 1, size=live.size, dtype=np.int32)
+        defend = rng.integers(fight.defend[0], fight.defend[1] + 1, size=live.size, dtype=np.int32)
+
+        attacking = actions == ATTACK
+        healing = actions == HEAL
+        enemy = np.where(attacking, enemy - attack, enemy)
+        player = np.where(healing, np.minimum(player + fight.heal, self.max_hp), player)
+
+        # Defending takes the reduced hit; everyone else is struck if the enemy still stands
+        incoming = np.where(actions == DEFEND, defend, np.where(enemy > 0, strike, 0))
+        player = np.maximum(player - incoming, 0)
+
+        self.player_hp[live] = player
+        self.enemy_hp[live] = enemy
+        self.turns[live] += 1
+        return live.size
+
+    def run(self, policy="attack", max_turns=MAX_TURNS):
+        """Fight every battle to the end with a policy and return self
+
+        policy is an action name, a (max_hp + 1, enemy_hp + 1) table of action
+        codes indexed by [player_hp, enemy_hp], or a callable taking the
+        player and enemy HP arrays and returning action codes.
+        """
+        for _ in range(max_turns):
+            if isinstance(policy, str):
+                actions = ACTIONS.index(policy) if policy != "random" else self.rng.integers(0, 3, size=self.player_hp.size)
+            elif callable(policy):
+                actions = policy(self.player_hp, self.enemy_hp)
+            else:
+                actions = policy[np.clip(self.player_hp, 0, self.max_hp), np.clip(self.enemy_hp, 0, self.combat.hp)]
+            if self.step(actions) == 0:
+                break
+        return self
+
+    def summary(self):
+        won = self.won
+        return {
+            "fights": int(self.player_hp.size),
+            "win_rate": float(won.mean()),
+            "loss_rate": float(self.lost.mean()),
+            "mean_turns": float(self.turns.mean()),
+            "mean_hp_left": float(self.player_hp[won].mean()) if won.any() else 0.0,
+            "unfinished": int(self.active.sum()),
+        }
+
+
+def policy_table(solution):
+    """Turn a combat_solver solution into an action-code table for BatchCombat.run"""
+    table = np.zeros((solution.max_hp + 1, solution.enemy_max_hp + 1), dtype=np.int8)
+    for h, row in enumerate(solution.policy):
+        for d, action in enumerate(row):
+            if action is not None:
+                table[h, d] = ACTIONS.index(action)
+    return table
+
+
+def simulate(combat, fights, policy="attack", chunk=1000000, seed=None, player_hp=100, max_hp=100):
+    """Run `fights` battles in memory-bounded chunks and merge their summaries"""
+    seeds = np.random.SeedSequence(seed).spawn(max(1, -(-fights // chunk)))
+    totals = {"fights": 0, "wins": 0, "losses": 0, "turns": 0, "hp_left": 0, "unfinished": 0}
+    for child, start in zip(seeds, range(0, fights, chunk)):
+        batch = BatchCombat(combat, min(chunk, fights - start), player_hp, max_hp, seed=child)
+        batch.run(policy)
+        won = batch.won
+        totals["fights"] += batch.player_hp.size
+        totals["wins"] += int(won.sum())
+        totals["losses"] += int(batch.lost.sum())
+        totals["turns"] += int(batch.turns.sum())
+        totals["hp_left"] += int(batch.player_hp[won].sum())
+        totals["unfinished"] += int(batch.active.sum())
+
+    fights = totals["fights"] or 1
+    return {
+        "fights": totals["fights"],
+        "win_rate": totals["wins"] / fights,
+        "loss_rate": totals["losses"] / fights,
+        "mean_turns": totals["turns"] / fights,
+        "mean_hp_left": totals["hp_left"] / (totals["wins"] or 1),
+        "unfinished": totals["unfinished"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many combat encounters at once")
+    parser.add_argument("-n", "--fights", type=int, default=1000000)
+    parser.add_argument("--scene", default="combat_droid", help="combat scene ID")
+    parser.add_argument("--policy", choices=ACTIONS + ("random", "optimal"), default="attack")
+    parser.add_argument("--hp", type=int, default=100, help="starting player HP")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    fight = Engine().scene(args.scene).combat
+    if fight is None:
+        parser.error(f"{args.scene} is not a combat scene")
+
+    policy = args.policy
+    if policy == "optimal":
+        from combat_solver import solve
+        policy = policy_table(solve(fight))
+
+    start = time.perf_counter()
+    result = simulate(fight, args.fights, policy, seed=args.seed, player_hp=args.hp)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{'='*50}")
+    print(f"{result['fights']} fights vs {fight.enemy} in {elapsed:.2f}s "
+          f"({result['fights'] / elapsed:,.0f} fights/s)")
+    print(f"{'='*50}")
+    print(f"Win rate: {result['win_rate']:.4%} | Loss rate: {result['loss_rate']:.4%}")
+    print(f"Mean turns: {result['mean_turns']:.3f}")
+    print(f"Mean HP left after a win: {result['mean_hp_left']:.2f}")
+    if result["unfinished"]:
+        print(f"Unfinished after {MAX_TURNS} turns: {result['unfinished']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""Benchmark suite for rendering, scene transitions and simulation throughput
+
+Every benchmark runs with fixed seeds and no real pacing: the typewriter
+gets a fake stdout and a virtual clock, and the GUI runs withdrawn on a
+virtual Scheduler. Results are stored as JSON so runs can be compared:
+
+    python bench.py --output baseline.json
+    python bench.py --compare baseline.json          # exit 1 on a regression
+    python bench.py --only playthrough --repeat 21
+
+GUI benchmarks need tkinter and a display (Xvfb works); without them they
+are reported as skipped, and --compare fails if the baseline has numbers
+for them, so a machine without a display cannot pass a GUI regression.
+"""
+import argparse
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+import terminal_game
+from engine import Engine, Player
+from simulate import RandomPolicy, playthrough
+from typewriter import Typewriter
+
+BENCHMARKS = {}
+REPEAT = 11  # runs per benchmark; the best of them is what gets compared
+MIN_COMPARE_REPEAT = 5  # fewer runs leave the best time too noisy to call a regression
+
+_engine = Engine()
+TEXT = "\n".join(line for scene in _engine.scenes for line in _engine.text(scene, Player("Bench")))
+
+
+class Skip(Exception):
+    """Raised by a benchmark that cannot run here"""
+
+
+def benchmark(unit):
+    """Register a benchmark; it sets up and returns (run callable, operations per run)"""
+    def register(func):
+        BENCHMARKS[func.__name__] = (func, unit)
+        return func
+    return register
+
+
+class FakeClock:
+    """Virtual clock whose sleep just advances time"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+# Terminal rendering
+
+@benchmark("chars")
+def slow_print():
+    fake = FakeClock()
+    stream = io.StringIO()
+    typewriter = Typewriter(stream, clock=fake.clock, sleep=fake.sleep)
+
+    def run():
+        stream.seek(0)
+        stream.truncate()
+        for line in TEXT.splitlines():
+            terminal_game.slow_print(line)
+    return _restoring(run, typewriter), len(TEXT)
+
+
+def _restoring(run, typewriter):
+    """Wrap run() so the benchmark typewriter is swapped in only while it runs"""
+    def timed():
+        saved, terminal_game.typewriter = terminal_game.typewriter, typewriter
+        try:
+            run()
+        finally:
+            terminal_game.typewriter = saved
+    return timed
+
+
+# Scene graph
+
+@benchmark("transitions")
+def scene_transition():
+    engine = Engine()
+    rng = random.Random(1)
+    walks = []
+    for _ in range(200):
+        scene, player, steps = engine.start, Player("Bench"), []
+        while scene.ending is None and not scene.combat:
+            choice = rng.randint(1, len(scene.choices)) if scene.choices else None
+            steps.append((scene, choice))
+            scene = engine.follow(scene, player, choice)
+        walks.append(steps)
+    count = sum(len(steps) for steps in walks)
+
+    def run():
+        for steps in walks:
+            player = Player("Bench")
+            for scene, choice in steps:
+                engine.text(scene, player)
+                engine.apply(scene, player)
+                engine.follow(scene, player, choice)
+    return run, count
+
+
+@benchmark("playthroughs")
+def playthrough_headless():
+    engine = Engine()
+    policy = RandomPolicy()
+
+    def run():
+        rng = random.Random(1)
+        for _ in range(2000):
+            playthrough(engine, policy, rng)
+    return run, 2000
+
+
+@benchmark("playthroughs")
+def playthrough_terminal():
+    """Full terminal game loop with instant text into a fake stdout"""
+    typewriter = Typewriter(io.StringIO(), mode="instant")
+    engine = Engine(rng=random.Random(1))
+
+    def run():
+        saved = sys.stdout
+        sys.stdout = typewriter.stream
+        try:
+            choose = terminal_game.autopilot(random.Random(1))
+            for _ in range(200):
+                terminal_game.play(engine, Player("Bench"), choose)
+        finally:
+            sys.stdout = saved
+            typewriter.stream.seek(0)
+            typewriter.stream.truncate()
+    return _restoring(run, typewriter), 200
+
+
+# GUI
+
+def _gui():
+    try:
+        import tkinter as tk
+        import gui_game
+        from scheduler import Scheduler
+        root = tk.Tk()
+    except Exception as error:  # no tkinter, or no display
+        raise Skip(f"Tk unavailable: {error}") from None
+    root.withdraw()
+    game = gui_game.GameGUI(root, scheduler=Scheduler(root, virtual=True), name="Bench")
+    game.scheduler.run()
+    return game
+
+
+@benchmark("chars")
+def gui_add_text():
+    """Queue text and drain it frame by frame through type_character"""
+    game = _gui()
+    lines = TEXT.splitlines()
+
+    def run():
+        for line in lines:
+            game.add_text(line)
+        game.scheduler.run()
+        game.story_text.config(state="normal")
+        game.story_text.delete("1.0", "end")
+    return run, sum(len(line) + 2 for line in lines)
+
+
+@benchmark("inserts")
+def gui_insert_text():
+    game = _gui()
+
+    def run():
+        for _ in range(1000):
+            game.insert_text("The gateway hums.\n")
+        game.story_text.config(state="normal")
+        game.story_text.delete("1.0", "end")
+    return run, 1000
+
+
+@benchmark("rebuilds")
+def gui_choices():
+    """clear_choices plus three add_choice calls, as on every turn"""
+    game = _gui()
+    labels = [f"{i}. {choice.label}" for i, choice in enumerate(game.engine.scene("distress_signal").choices, 1)]
+
+    def run():
+        for _ in range(500):
+            game.clear_choices()
+            for label in labels:
+                game.add_choice(label, lambda: None)
+        game.clear_choices()
+    return run, 500
+
+
+@benchmark("transitions")
+def gui_show_scene():
+    game = _gui()
+    engine = game.engine
+    scenes = [engine.scene(scene_id) for scene_id in ("distress_signal", "investigate_ship", "ancient_artifact")]
+
+    def run():
+        for _ in range(100):
+            for scene in scenes:
+                game.player = Player("Bench")
+                game.show_scene(scene)
+                game.scheduler.run()
+        game.story_text.config(state="normal")
+        game.story_text.delete("1.0", "end")
+    return run, 300
+
+
+# Harness
+
+def measure(name, repeat):
+    func, unit = BENCHMARKS[name]
+    try:
+        run, ops = func()
+    except Skip as skip:
+        return {"skipped": str(skip)}
+    run()  # warm up
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    return {
+        "unit": unit,
+        "ops": ops,
+        "best_s": best,
+        "median_s": statistics.median(times),
+        "ops_per_sec": ops / best,
+    }
+
+
+def run_all(names, repeat=REPEAT):
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "repeat": repeat,
+        "results": {name: measure(name, repeat) for name in names},
+    }
+
+
+def compare(results, baseline, threshold, only=()):
+    """(regressions, missing): benchmarks more than `threshold` slower than the
+    baseline, and baseline benchmarks that gave no numbers this time (skipped or gone)"""
+    regressions = []
+    missing = []
+    for name, before in baseline["results"].items():
+        if "ops_per_sec" not in before or (only and not any(text in name for text in only)):
+            continue
+        result = results["results"].get(name, {})
+        if "ops_per_sec" not in result:
+            missing.append(name)
+            continue
+        change = result["ops_per_sec"] / before["ops_per_sec"] - 1
+        result["change"] = change
+        if change < -threshold:
+            regressions.append(name)
+    return regressions, missing
+
+
+def print_report(results, regressions=()):
+    print(f"\n{'='*60}")
+    print(f"Python {results['python']} | best of {results['repeat']}")
+    print(f"{'='*60}")
+    for name, result in results["results"].items():
+        if "skipped" in result:
+            print(f"{name:<22} skipped ({result['skipped']})")
+            continue
+        change = f"{result['change']:+8.1%}" if "change" in result else ""
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:<22} {result['ops_per_sec']:>14,.0f} {result['unit']}/s {change}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Starship Odyssey rendering and simulation")
+    parser.add_argument("--only", action="append", default=[], metavar="TEXT",
+                        help="run benchmarks whose name contains TEXT")
+    parser.add_argument("--repeat", type=int, default=REPEAT,
+                        help=f"runs per benchmark, best kept (default {REPEAT}; --compare needs {MIN_COMPARE_REPEAT}+)")
+    parser.add_argument("--output", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="slowdown of the best run that counts as a regression (default 0.25 = 25%%)")
+    parser.add_argument("--list", action="store_true", help="list benchmarks and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if args.compare and args.repeat < MIN_COMPARE_REPEAT:
+        parser.error(f"--compare needs --repeat {MIN_COMPARE_REPEAT} or more for a stable best time")
+    names = [name for name in BENCHMARKS if not args.only or any(text in name for text in args.only)]
+    results = run_all(names, args.repeat)
+    regressions, missing = [], []
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions, missing = compare(results, baseline, args.threshold, args.only)
+        # A slowdown has to survive a second round of runs, since one busy spell
+        # on the machine can slow every run of a benchmark
+        for name in regressions:
+            again = measure(name, args.repeat)
+            if again["ops_per_sec"] > results["results"][name]["ops_per_sec"]:
+                results["results"][name] = again
+        if regressions:
+            regressions, missing = compare(results, baseline, args.threshold, args.only)
+    print_report(results, regressions)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+    if missing:
+        print(f"\nNo result for {len(missing)} baseline benchmark(s): {', '.join(missing)}")
+    if regressions or missing:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
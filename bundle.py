@@ -0,0 +1,64 @@
+"""Precompiled story bundle
+
+The story tables (SCENES, START, COMBAT_ACTIONS) are marshalled into
+__pycache__/story.bundle together with a hash of story.py's source. Loading
+reads the source, hashes it and unmarshals the bundle when the hash still
+matches, so the story module itself is only executed after it changes.
+
+    from bundle import story    # same attributes as `import story`
+"""
+import hashlib
+import marshal
+import os
+import sys
+import time
+import types
+
+SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "story.py")
+CACHE = os.path.join(os.path.dirname(SOURCE), "__pycache__", "story.bundle")
+FIELDS = ("SCENES", "START", "COMBAT_ACTIONS")
+VERSION = 2
+
+stats = {"cache": None, "ms": 0.0}  # filled in by load(), for startup reports
+
+
+def _key(source):
+    # marshal's format can change between Python versions, so they get separate keys
+    return f"{VERSION}:{sys.version_info[0]}.{sys.version_info[1]}:{hashlib.sha1(source).hexdigest()}"
+
+
+def _write(key, tables):
+    tmp = f"{CACHE}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(CACHE), exist_ok=True)
+        with open(tmp, "wb") as f:
+            marshal.dump((key, tables), f)
+        os.replace(tmp, CACHE)
+    except OSError:  # read-only checkout: run uncached
+        pass
+
+
+def load():
+    """Story tables as a namespace, from the bundle when it is current"""
+    start = time.perf_counter()
+    with open(SOURCE, "rb") as f:
+        key = _key(f.read())
+    tables = None
+    try:
+        with open(CACHE, "rb") as f:
+            cached_key, cached = marshal.load(f)
+        if cached_key == key:
+            tables = cached
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    stats["cache"] = "hit" if tables is not None else "miss"
+    if tables is None:
+        import story as module
+        tables = {name: getattr(module, name) for name in FIELDS}
+        _write(key, tables)
+    stats["ms"] = (time.perf_counter() - start) * 1000
+    return types.SimpleNamespace(**tables)
+
+
+story = load()
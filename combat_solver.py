@@ -0,0 +1,228 @@
+"""Exact Markov-chain solver for combat encounters
+
+Every fight is a Markov chain over (player_hp, enemy_hp) states with the same
+uniform damage rolls that Engine.combat_turn uses. The solver computes the
+exact win probability, the expected number of turns and the best
+attack/defend/heal choice for every state, without sampling.
+
+    python combat_solver.py
+    python combat_solver.py --scene combat_droid --step 5
+"""
+import argparse
+import time
+from functools import lru_cache
+
+from engine import Engine
+
+ACTIONS = ("attack", "defend", "heal")
+TOLERANCE = 1e-12
+TIE = 1e-9
+MAX_SWEEPS = 10000
+
+
+class CombatSolution:
+    """Solved tables indexed as table[player_hp][enemy_hp]"""
+
+    def __init__(self, max_hp, enemy_max_hp, win, turns, policy):
+        self.max_hp = max_hp
+        self.enemy_max_hp = enemy_max_hp
+        self.win = win
+        self.turns = turns
+        self.policy = policy
+
+    def win_probability(self, player_hp=None, enemy_hp=None):
+        return self.win[self._hp(player_hp)][self._enemy(enemy_hp)]
+
+    def expected_turns(self, player_hp=None, enemy_hp=None):
+        return self.turns[self._hp(player_hp)][self._enemy(enemy_hp)]
+
+    def best_action(self, player_hp=None, enemy_hp=None):
+        """Best action, or None once the fight is over"""
+        return self.policy[self._hp(player_hp)][self._enemy(enemy_hp)]
+
+    def _hp(self, player_hp):
+        if player_hp is None:
+            return self.max_hp
+        return max(0, min(player_hp, self.max_hp))
+
+    def _enemy(self, enemy_hp):
+        if enemy_hp is None:
+            return self.enemy_max_hp
+        return max(0, min(enemy_hp, self.enemy_max_hp))
+
+
+def _prefix(values):
+    """prefix[i] is the sum of values[:i]"""
+    prefix = [0.0] * (len(values) + 1)
+    for i, value in enumerate(values):
+        prefix[i + 1] = prefix[i] + value
+    return prefix
+
+
+def _window(prefix, lo, hi):
+    """Sum of values[lo..hi]; indices at or below 0 are dead states worth 0"""
+    lo = max(lo, 1)
+    if hi < lo:
+        return 0.0
+    return prefix[hi + 1] - prefix[lo]
+
+
+class _Sweep:
+    """Gauss-Seidel sweep over one column, from the top HP down
+
+    Values above the current HP are fresh from this sweep, values below are
+    from the previous sweep, and a self-transition is solved algebraically.
+    """
+
+    def __init__(self, column):
+        self.column = column
+        self.stale = _prefix(column)
+        self.suffix = [0.0] * (len(column) + 1)
+
+    def expect(self, h, lo, hi, width):
+        """Split E[column[h - roll]] over [lo, hi] into (other mass, self probability)"""
+        above = 0.0
+        if hi > h:
+            start = max(lo, h + 1)
+            above = self.suffix[start] - self.suffix[hi + 1]
+        below = _window(self.stale, lo, min(hi, h - 1))
+        loop = 1.0 / width if lo <= h <= hi else 0.0
+        return (above + below) / width, loop
+
+    def set(self, h, value):
+        self.column[h] = value
+        self.suffix[h] = value + self.suffix[h + 1]
+
+
+def _after_strike(column, strike):
+    """E[column[h - strike]] for every h, the value of a state right before the enemy hits"""
+    prefix = _prefix(column)
+    width = strike[1] - strike[0] + 1
+    return [_window(prefix, h - strike[1], h - strike[0]) / width for h in range(len(column))]
+
+
+def _solve_column(d, rules, max_hp, win_struck, turns_struck):
+    """Solve one enemy-HP column; every lower column is already final"""
+    attack, strike, defend, heal = rules
+    attack_rolls = range(attack[0], attack[1] + 1)
+    strike_width = strike[1] - strike[0] + 1
+    defend_width = defend[1] - defend[0] + 1
+
+    # Attacks always lower the enemy's HP, so they only reach finished columns
+    attack_win = [0.0] * (max_hp + 1)
+    attack_turns = [0.0] * (max_hp + 1)
+    for a in attack_rolls:
+        if d - a <= 0:
+            for h in range(1, max_hp + 1):
+                attack_win[h] += 1.0
+        else:
+            column_win, column_turns = win_struck[d - a], turns_struck[d - a]
+            for h in range(1, max_hp + 1):
+                attack_win[h] += column_win[h]
+                attack_turns[h] += column_turns[h]
+    for h in range(1, max_hp + 1):
+        attack_win[h] /= len(attack_rolls)
+        attack_turns[h] = 1 + attack_turns[h] / len(attack_rolls)
+
+    def moves(sweep, h):
+        """(other mass, self probability) for defend and heal from h"""
+        healed = min(h + heal, max_hp)
+        return (
+            sweep.expect(h, h - defend[1], h - defend[0], defend_width),
+            sweep.expect(h, healed - strike[1], healed - strike[0], strike_width),
+        )
+
+    # Win probability
+    win = [0.0] * (max_hp + 1)
+    for _ in range(MAX_SWEEPS):
+        sweep = _Sweep(win)
+        change = 0.0
+        for h in range(max_hp, 0, -1):
+            best = attack_win[h]
+            for other, loop in moves(sweep, h):
+                best = max(best, other / (1 - loop))
+            change = max(change, abs(best - win[h]))
+            sweep.set(h, best)
+        if change < TOLERANCE:
+            break
+
+    # Among the actions that keep the best win probability, pick the fastest
+    final = _Sweep(win)
+    final.suffix = _prefix(win[::-1])[::-1]
+    allowed = [None] * (max_hp + 1)
+    for h in range(1, max_hp + 1):
+        values = [attack_win[h]] + [other / (1 - loop) for other, loop in moves(final, h)]
+        allowed[h] = [i for i, value in enumerate(values) if value >= win[h] - TIE]
+
+    turns = [0.0] * (max_hp + 1)
+    policy = [None] * (max_hp + 1)
+    for _ in range(MAX_SWEEPS):
+        sweep = _Sweep(turns)
+        change = 0.0
+        for h in range(max_hp, 0, -1):
+            options = [attack_turns[h]] + [(1 + other) / (1 - loop) for other, loop in moves(sweep, h)]
+            best = min(allowed[h], key=lambda i: options[i])
+            change = max(change, abs(options[best] - turns[h]))
+            policy[h] = ACTIONS[best]
+            sweep.set(h, options[best])
+        if change < TOLERANCE:
+            break
+
+    return win, turns, policy
+
+
+@lru_cache(maxsize=32)
+def _solve(attack, strike, defend, heal, enemy_max_hp, max_hp):
+    width = enemy_max_hp + 1
+    win = [[0.0] * width for _ in range(max_hp + 1)]
+    turns = [[0.0] * width for _ in range(max_hp + 1)]
+    policy = [[None] * width for _ in range(max_hp + 1)]
+    win_struck = [None] * width
+    turns_struck = [None] * width
+    for h in range(1, max_hp + 1):
+        win[h][0] = 1.0  # the enemy is down: won, with no turns or actions left
+
+    for d in range(1, width):
+        column_win, column_turns, column_policy = _solve_column(
+            d, (attack, strike, defend, heal), max_hp, win_struck, turns_struck
+        )
+        win_struck[d] = _after_strike(column_win, strike)
+        turns_struck[d] = _after_strike(column_turns, strike)
+        for h in range(max_hp + 1):
+            win[h][d] = column_win[h]
+            turns[h][d] = column_turns[h]
+            policy[h][d] = column_policy[h]
+    return CombatSolution(max_hp, enemy_max_hp, win, turns, policy)
+
+
+def solve(combat, max_hp=100):
+    """Solve a combat encounter exactly (results are cached per set of rules)"""
+    return _solve(tuple(combat.attack), tuple(combat.strike), tuple(combat.defend),
+                  combat.heal, combat.hp, max_hp)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a combat encounter exactly")
+    parser.add_argument("--scene", default="combat_droid", help="combat scene ID")
+    parser.add_argument("--step", type=int, default=10, help="player HP step for the table")
+    args = parser.parse_args()
+
+    fight = Engine().scene(args.scene).combat
+    if fight is None:
+        parser.error(f"{args.scene} is not a combat scene")
+
+    start = time.perf_counter()
+    solution = solve(fight)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{'='*50}")
+    print(f"{fight.enemy} ({fight.hp} HP) solved in {elapsed * 1000:.1f} ms")
+    print(f"{'='*50}")
+    print(f"{'HP':>5} {'Win':>9} {'Turns':>7}  Best action")
+    for hp in range(solution.max_hp, 0, -args.step):
+        print(f"{hp:>5} {solution.win_probability(hp):>9.4%} "
+              f"{solution.expected_turns(hp):>7.2f}  {solution.best_action(hp)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+"""Scene graph engine shared by the terminal, GUI and server frontends"""
+import random
+
+import textpack
+from bundle import story
+
+
+class Player:
+    def __init__(self, name):
+        self.name = name
+        self.hp = 100
+        self.max_hp = 100
+        self.energy = 50
+        self.inventory = []
+        self.crew_members = []
+
+    def take_damage(self, damage):
+        self.hp -= damage
+        if self.hp < 0:
+            self.hp = 0
+
+    def heal(self, amount):
+        self.hp += amount
+        if self.hp > self.max_hp:
+            self.hp = self.max_hp
+
+
+class Choice:
+    __slots__ = ("_label", "target", "scene", "number")
+
+    def __init__(self, label, target, scene=None, number=0):
+        self._label = label
+        self.target = target
+        self.scene = scene  # scene whose text pack entry holds the label, until it is read
+        self.number = number
+
+    @property
+    def label(self):
+        if self._label is None:
+            labels = self.scene.labels()
+            target = getattr(self.target, "id", self.target)
+            self._label = labels[self.number] if self.number < len(labels) else target
+            self.scene = None
+        return self._label
+
+
+class Combat:
+    __slots__ = ("enemy", "hp", "attack", "strike", "defend", "heal", "win", "lose")
+
+    def __init__(self, data):
+        self.enemy = data["enemy"]
+        self.hp = data["hp"]
+        self.attack = data["attack"]
+        self.strike = data["strike"]
+        self.defend = data["defend"]
+        self.heal = data["heal"]
+        self.win = data["win"]
+        self.lose = data["lose"]
+
+
+class Scene:
+    __slots__ = (
+        "id", "index", "text", "stats", "effects", "_prompt",
+        "choices", "next", "delay", "combat", "ending", "words", "_labels",
+    )
+
+    def __init__(self, scene_id, index, data, words):
+        self.id = scene_id
+        self.index = index
+        self.words = words
+        self._labels = None
+        # Narration, prompt and choice labels stay in the text pack until shown, unless given inline
+        self.text = tuple(data["text"]) if "text" in data else None
+        self.stats = data.get("stats", False)
+        self.effects = tuple(data.get("effects", ()))
+        self._prompt = data.get("prompt") or False
+        self.choices = tuple(
+            Choice(*choice) if isinstance(choice, (tuple, list)) else Choice(None, choice, self, i)
+            for i, choice in enumerate(data.get("choices", ()))
+        )
+        self.delay = data.get("delay", 0)
+        self.combat = Combat(data["combat"]) if "combat" in data else None
+        self.ending = data.get("ending")
+
+        branches = data.get("next")
+        if isinstance(branches, str):
+            branches = [(None, branches)]
+        self.next = tuple(branches or ())
+
+    @property
+    def prompt(self):
+        if self._prompt is False:  # not looked up yet
+            self._prompt = self.words.get(f"{self.id}.prompt")
+        return self._prompt
+
+    def labels(self):
+        """Choice labels from the text pack, read on first use"""
+        if self._labels is None:
+            self._labels = self.words.lines(f"{self.id}.choices")
+        return self._labels
+
+
+def check(condition, player):
+    """Evaluate a story condition against the player"""
+    if condition is None:
+        return True
+    kind = condition[0]
+    if kind == "has_any":
+        return any(item in player.inventory for item in condition[1:])
+    if kind == "has_all":
+        return all(item in player.inventory for item in condition[1:])
+    if kind == "has_crew":
+        return condition[1] in player.crew_members
+    raise ValueError(f"Unknown condition: {kind}")
+
+
+def apply_effect(effect, player):
+    """Apply a single story effect to the player"""
+    kind, value = effect
+    if kind == "item":
+        player.inventory.append(value)
+    elif kind == "crew":
+        player.crew_members.append(value)
+    elif kind == "energy":
+        player.energy += value
+    elif kind == "hp":
+        player.hp += value
+    else:
+        raise ValueError(f"Unknown effect: {kind}")
+
+
+class Engine:
+    """Compiled scene table with O(1) lookup and pre-linked transitions"""
+
+    def __init__(self, scenes=None, start=None, rng=None, language=textpack.DEFAULT):
+        scenes = story.SCENES if scenes is None else scenes
+        self.rng = rng or random  # seed a random.Random here for reproducible runs
+        self.words = textpack.load(language)
+        self.combat_actions = [
+            (action, self.words.get(f"combat.{action}", action), icon) for action, icon in story.COMBAT_ACTIONS
+        ]
+        self.scenes = [Scene(scene_id, index, data, self.words) for index, (scene_id, data) in enumerate(scenes.items())]
+        self.ids = {scene.id: scene for scene in self.scenes}
+        self.providers = {}  # scene ID prefix -> function returning data for generated scenes
+        self.detours = {}  # generated scene ID -> story scene it stands in for (see detour())
+        self.fleet = 0  # ships per side when combat is fought fleet against fleet
+        self.telemetry = None  # telemetry.Telemetry that records choices, combat and endings
+        self.start = self.scene(start or story.START)
+        self._index = None
+        self._link()
+
+    def _link(self):
+        """Resolve every target ID to its Scene object"""
+        for scene in self.scenes:
+            for choice in scene.choices:
+                choice.target = self.scene(choice.target)
+            scene.next = tuple((condition, self.scene(target)) for condition, target in scene.next)
+            if scene.combat:
+                scene.combat.win = self.scene(scene.combat.win)
+                scene.combat.lose = self.scene(scene.combat.lose)
+            if not (scene.choices or scene.next or scene.combat or scene.ending is not None):
+                raise ValueError(f"Scene {scene.id!r} has no way forward")
+
+    def scene(self, scene_id):
+        """Look up a scene by ID, generating it if a provider owns its prefix"""
+        try:
+            return self.ids[scene_id]
+        except KeyError:
+            pass
+        prefix, sep, rest = scene_id.partition(":")
+        make = self.providers.get(prefix) if sep else None
+        if make is None:
+            raise ValueError(f"Unknown scene: {scene_id!r}")
+        # Generated scenes keep their targets as IDs; follow() resolves them on use
+        scene = self.ids[scene_id] = Scene(scene_id, len(self.ids), make(scene_id), self.words)
+        return scene
+
+    def provide(self, prefix, make):
+        """Generate scenes with IDs "<prefix>:..." on demand from make(scene_id) -> scene data"""
+        self.providers[prefix] = make
+
+    def detour(self, scene_id, via):
+        """Send every story link into `scene_id` to the scene `via` instead"""
+        target, replacement = self.scene(scene_id), self.scene(via)
+        swap = lambda scene: replacement if scene is target else scene
+        for scene in self.scenes:
+            for choice in scene.choices:
+                choice.target = swap(choice.target)
+            scene.next = tuple((condition, swap(branch)) for condition, branch in scene.next)
+            if scene.combat:
+                scene.combat.win = swap(scene.combat.win)
+                scene.combat.lose = swap(scene.combat.lose)
+        self.start = swap(self.start)
+        self.detours[replacement.id] = target.id
+        self._index = None
+
+    def index(self):
+        """Reachability index over the written story, built on first use
+
+        Generated scenes are not indexed: a link detoured into one counts as a
+        link to the story scene it stands in for.
+        """
+        if self._index is None:
+            from storygraph import ReachabilityIndex
+            self._index = ReachabilityIndex(self)
+        return self._index
+
+    def intro(self):
+        """Title and opening narration, as blocks of lines"""
+        return self.words.intro()
+
+    def text(self, scene, player):
+        """Narration lines for a scene, personalised for the player"""
+        lines = scene.text if scene.text is not None else self.words.lines(f"{scene.id}.text")
+        return [line.replace("{name}", player.name) for line in lines]
+
+    def apply(self, scene, player):
+        """Apply the scene's effects to the player"""
+        for effect in scene.effects:
+            apply_effect(effect, player)
+        if scene.ending is not None and self.telemetry:
+            self.telemetry.end(player, scene)
+
+    def follow(self, scene, player, choice=None):
+        """Return the scene reached from `scene` by a 1-based choice or its next branch"""
+        if choice is not None:
+            target = scene.choices[choice - 1].target
+            if self.telemetry:
+                self.telemetry.emit("choice", player, scene=scene.id, n=choice)
+        else:
+            for condition, target in scene.next:
+                if check(condition, player):
+                    break
+            else:
+                raise ValueError(f"Scene {scene.id!r} has no matching branch")
+        return target if type(target) is Scene else self.scene(target)
+
+    def combat_turn(self, combat, player, enemy_hp, action, rng=None):
+        """Resolve one combat action and return (enemy_hp, messages)"""
+        rng = rng or self.rng
+        messages = []
+        start_enemy_hp, incoming = enemy_hp, 0
+        if action == "attack":
+            damage = rng.randint(*combat.attack)
+            enemy_hp -= damage
+            messages.append(f"\nYou attack for {damage} damage!")
+        elif action == "defend":
+            messages.append("\nYou take a defensive stance!")
+            incoming = rng.randint(*combat.defend)
+            player.take_damage(incoming)
+            messages.append(f"{combat.enemy} attacks for {incoming} damage (reduced)!")
+            if self.telemetry:
+                self.telemetry.emit("combat", player, enemy=combat.enemy, action=action, dealt=0, taken=incoming)
+            return enemy_hp, messages
+        elif action == "heal":
+            player.heal(combat.heal)
+            messages.append(f"\nYou use a med-kit and heal {combat.heal} HP!")
+        else:
+            raise ValueError(f"Unknown combat action: {action}")
+
+        if enemy_hp > 0:
+            incoming = rng.randint(*combat.strike)
+            player.take_damage(incoming)
+            messages.append(f"{combat.enemy} attacks for {incoming} damage!")
+        if self.telemetry:
+            self.telemetry.emit("combat", player, enemy=combat.enemy, action=action,
+                                dealt=start_enemy_hp - enemy_hp, taken=incoming)
+        return enemy_hp, messages
+
+    def fleet_battle(self, combat, player):
+        """Fleet version of a combat encounter with the player's flagship, or None for a duel"""
+        if not self.fleet:
+            return None
+        from fleet import FleetBattle
+        return FleetBattle(combat, self.fleet, player_hp=player.hp, max_hp=player.max_hp,
+                           seed=self.rng.getrandbits(32))
+
+    def fleet_turn(self, battle, player, action):
+        """Resolve one fleet-wide order and return its messages; the flagship's HP is the player's"""
+        messages = battle.turn(action)
+        player.hp = battle.flagship_hp
+        if self.telemetry:
+            self.telemetry.emit("combat", player, enemy=battle.combat.enemy, action=action,
+                                dealt=battle.report["damage"], taken=battle.report["incoming"])
+        return messages
+
+    def combat_result(self, combat, player, enemy_hp):
+        """Scene reached once the fight is over, or None while it goes on"""
+        if player.hp <= 0:
+            return combat.lose
+        if enemy_hp <= 0:
+            return combat.win
+        return None
+
+    def steps(self, scene, player):
+        """Run one scene as a generator that frontends drive, blocking or async
+
+        Yields what to show or ask for, in order:
+            ("stats",)                   show the player's stats
+            ("text", line)               show a line of narration or combat
+            ("status",)                  the player's HP, items or crew may have changed
+            ("choose", heading, labels)  offer numbered options; send() back the 1-based pick
+            ("pause", seconds)           dramatic pause
+        and returns the next scene, or None once an ending is reached.
+        """
+        if scene.stats:
+            yield ("stats",)
+        for line in self.text(scene, player):
+            yield ("text", line)
+        self.apply(scene, player)
+        yield ("status",)
+
+        if scene.ending is not None:
+            return None
+        if scene.combat:
+            return (yield from self._combat_steps(scene.combat, player))
+        if scene.choices:
+            choice = yield ("choose", f"\n{scene.prompt}", [choice.label for choice in scene.choices])
+            return self.follow(scene, player, choice)
+        return self.follow(scene, player)
+
+    def _combat_steps(self, fight, player):
+        """Combat rounds for steps(), fought fleet against fleet when self.fleet is set"""
+        labels = [label for action, label, icon in self.combat_actions]
+        battle = self.fleet_battle(fight, player)
+        enemy_hp = fight.hp
+        while (battle.result() is None) if battle else (enemy_hp > 0 and player.hp > 0):
+            if battle:
+                heading = f"{battle.status()}\n"
+            else:
+                heading = f"{fight.enemy} HP: {enemy_hp} | Your HP: {player.hp}\n"
+            action = self.combat_actions[(yield ("choose", heading, labels)) - 1][0]
+            if battle:
+                messages = self.fleet_turn(battle, player, action)
+            else:
+                enemy_hp, messages = self.combat_turn(fight, player, enemy_hp, action)
+            for message in messages:
+                yield ("text", message)
+            yield ("status",)
+            if action != "defend":
+                yield ("pause", 1)
+        if battle:
+            enemy_hp = battle.enemy.count()
+        return self.combat_result(fight, player, enemy_hp)
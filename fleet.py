@@ -0,0 +1,201 @@
+"""Fleet combat: hundreds of ships per side resolved as array operations
+
+Each side is a Fleet holding its ships as parallel NumPy arrays (hp,
+shields, energy, target). A round follows the duel rules in
+Engine.combat_turn, applied to every ship at once:
+
+    attack - each attacker rolls combat.attack damage against its target
+    defend - the ship takes a combat.defend hit instead of a combat.strike
+    heal   - the ship repairs combat.heal HP, costing HEAL_ENERGY energy
+             (ships out of energy defend instead)
+
+Your fleet acts first; enemy ships still standing then strike back at their
+targets. Damage to one ship is summed with bincount, drained from shields
+first and clamped at 0 HP like Player.take_damage; repairs are capped at
+max HP like Player.heal. Ship 0 is your flagship: the battle is lost when it
+falls and won when every enemy ship is destroyed.
+
+    python fleet.py --ships 500 --enemy-ships 800
+"""
+import argparse
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from engine import Engine
+
+ACTIONS = ("attack", "defend", "heal")
+ATTACK, DEFEND, HEAL = range(3)
+HEAL_ENERGY = 10
+FRAME_MS = 1000 / 60
+
+
+class Fleet:
+    """One side's ships as struct-of-arrays"""
+
+    def __init__(self, ships, hp, max_hp, shields=0, energy=0):
+        self.max_hp = max_hp
+        self.hp = np.full(ships, hp, dtype=np.int32)
+        self.shields = np.full(ships, shields, dtype=np.int32)
+        self.energy = np.full(ships, energy, dtype=np.int32)
+        self.target = np.full(ships, -1, dtype=np.int32)
+
+    def __len__(self):
+        return self.hp.size
+
+    @property
+    def alive(self):
+        return self.hp > 0
+
+    def count(self):
+        return int(np.count_nonzero(self.hp > 0))
+
+    def take_damage(self, damage):
+        """Apply per-ship damage: shields first, then hull, never below 0"""
+        absorbed = np.minimum(self.shields, damage)
+        self.shields -= absorbed
+        np.maximum(self.hp - (damage - absorbed), 0, out=self.hp)
+
+    def heal(self, ships, amount):
+        self.hp[ships] = np.minimum(self.hp[ships] + amount, self.max_hp)
+
+    def retarget(self, enemy, rng, focus=False):
+        """Point every live ship whose target is gone at a live enemy ship"""
+        alive = np.flatnonzero(enemy.alive)
+        if alive.size == 0:
+            self.target[:] = -1
+            return
+        if focus:
+            self.target[:] = alive[np.argmin(enemy.hp[alive])]
+            return
+        lost = (self.target < 0) | (enemy.hp[np.maximum(self.target, 0)] <= 0)
+        lost &= self.alive
+        count = int(np.count_nonzero(lost))
+        if count:
+            self.target[lost] = alive[rng.integers(0, alive.size, size=count)]
+
+
+class FleetBattle:
+    """Your fleet against an enemy fleet built from one combat encounter"""
+
+    def __init__(self, combat, ships=200, enemy_ships=None, player_hp=100, max_hp=100,
+                 shields=10, energy=50, seed=None):
+        if np is None:
+            raise ImportError("fleet combat needs NumPy: pip install numpy")
+        self.combat = combat
+        self.rng = np.random.default_rng(seed)
+        self.fleet = Fleet(ships, max_hp, max_hp, shields, energy)
+        self.fleet.hp[0] = player_hp  # the flagship carries the captain's own HP
+        self.enemy = Fleet(enemy_ships or ships, combat.hp, combat.hp)
+        self.turns = 0
+        self.report = None  # what the last turn() resolved, as returned by step()
+
+    @property
+    def flagship_hp(self):
+        return int(self.fleet.hp[0])
+
+    def result(self):
+        """"win", "lose", or None while the battle goes on"""
+        if self.fleet.hp[0] <= 0:
+            return "lose"
+        if not self.enemy.alive.any():
+            return "win"
+        return None
+
+    def _rolls(self, low_high, size):
+        return self.rng.integers(low_high[0], low_high[1] + 1, size=size, dtype=np.int32)
+
+    def step(self, actions, focus=False):
+        """Resolve one round; actions is a code or an array of codes per ship"""
+        fleet, enemy, fight = self.fleet, self.enemy, self.combat
+        actions = np.broadcast_to(np.asarray(actions, dtype=np.int8), fleet.hp.shape)
+        alive = fleet.alive
+        healing = alive & (actions == HEAL) & (fleet.energy >= HEAL_ENERGY)
+        defending = alive & ((actions == DEFEND) | ((actions == HEAL) & ~healing))
+        attacking = alive & (actions == ATTACK)
+
+        # Your fleet: attacks land first, then repairs
+        fleet.retarget(enemy, self.rng, focus)
+        shooters = np.flatnonzero(attacking)
+        damage = self._rolls(fight.attack, shooters.size)
+        before = enemy.count()
+        enemy.take_damage(np.bincount(fleet.target[shooters], weights=damage,
+                                      minlength=len(enemy)).astype(np.int32))
+        fleet.heal(healing, fight.heal)
+        fleet.energy[healing] -= HEAL_ENERGY
+
+        # Surviving enemies strike back; defenders take the reduced hit
+        enemy.retarget(fleet, self.rng)
+        strikers = np.flatnonzero(enemy.alive)
+        targets = enemy.target[strikers]
+        incoming = np.where(defending[targets], self._rolls(fight.defend, strikers.size),
+                            self._rolls(fight.strike, strikers.size))
+        lost_before = fleet.count()
+        fleet.take_damage(np.bincount(targets, weights=incoming, minlength=len(fleet)).astype(np.int32))
+
+        self.turns += 1
+        return {
+            "shots": int(shooters.size),
+            "damage": int(damage.sum()),
+            "kills": before - enemy.count(),
+            "repairs": int(np.count_nonzero(healing)),
+            "incoming": int(incoming.sum()),
+            "losses": lost_before - fleet.count(),
+        }
+
+    def turn(self, action, focus=False):
+        """Resolve one fleet-wide order and describe it like Engine.combat_turn"""
+        report = self.report = self.step(ACTIONS.index(action), focus)
+        enemy = self.combat.enemy
+        messages = []
+        if action == "attack":
+            messages.append(f"\nYour fleet fires {report['shots']} volleys for {report['damage']} damage, "
+                            f"destroying {report['kills']} {enemy}s!")
+        elif action == "defend":
+            messages.append("\nYour fleet takes a defensive formation!")
+        else:
+            messages.append(f"\n{report['repairs']} ships repair {self.combat.heal} HP each!")
+        messages.append(f"The {enemy} fleet strikes for {report['incoming']} damage; you lose {report['losses']} ships.")
+        return messages
+
+    def status(self):
+        return (f"{self.combat.enemy} fleet: {self.enemy.count()}/{len(self.enemy)} | "
+                f"Your fleet: {self.fleet.count()}/{len(self.fleet)} | Flagship HP: {self.flagship_hp}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time fleet battles against the frame budget")
+    parser.add_argument("--ships", type=int, default=500)
+    parser.add_argument("--enemy-ships", type=int, default=None)
+    parser.add_argument("--scene", default="combat_droid", help="combat scene the enemy ships copy")
+    parser.add_argument("--policy", choices=ACTIONS, default="attack")
+    parser.add_argument("--focus", action="store_true", help="whole fleet fires on the weakest enemy")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    fight = Engine().scene(args.scene).combat
+    if fight is None:
+        parser.error(f"{args.scene} is not a combat scene")
+    battle = FleetBattle(fight, args.ships, args.enemy_ships, seed=args.seed)
+    times = []
+    while battle.result() is None and battle.turns < 10000:
+        start = time.perf_counter()
+        battle.step(ACTIONS.index(args.policy), args.focus)
+        times.append((time.perf_counter() - start) * 1000)
+
+    print(f"\n{'='*50}")
+    print(f"{len(battle.fleet)} ships vs {len(battle.enemy)} {fight.enemy}s: {battle.result() or 'unfinished'} "
+          f"after {battle.turns} rounds")
+    print(f"{'='*50}")
+    print(battle.status())
+    if times:
+        worst = max(times)
+        print(f"Round time: mean {sum(times) / len(times):.3f} ms | worst {worst:.3f} ms "
+              f"({'within' if worst <= FRAME_MS else 'OVER'} the {FRAME_MS:.1f} ms frame budget)")
+
+
+if __name__ == "__main__":
+    main()
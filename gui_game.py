@@ -1,41 +1,59 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import argparse
 import random
-import time
+from collections import deque
 
-class Player:
-    def __init__(self, name):
-        self.name = name
-        self.hp = 100
-        self.max_hp = 100
-        self.energy = 50
-        self.inventory = []
-        self.crew_members = []
-        
-    def take_damage(self, damage):
-        self.hp -= damage
-        if self.hp < 0:
-            self.hp = 0
-            
-    def heal(self, amount):
-        self.hp += amount
-        if self.hp > self.max_hp:
-            self.hp = self.max_hp
+from engine import Engine, Player
+from scheduler import Scheduler
 
 class GameGUI:
-    def __init__(self, root):
+    def __init__(self, root, scrollback=2000, archive=None, scheduler=None, name=None, save=None, seed=None,
+                 language="en", systems=0, fleet=0, telemetry=None):
         self.root = root
         self.root.title("Starship Odyssey: The Lost Sector")
         self.root.geometry("900x700")
         self.root.configure(bg="#0a0e27")
         
+        self.engine = Engine(rng=random.Random(seed), language=language)
+        self.engine.fleet = fleet
+        self.engine.telemetry = telemetry
+        if systems:
+            from sector import Sector, install
+            install(self.engine, Sector(systems, seed))
+        self.scheduler = scheduler or Scheduler(root)
+        self.captain_name = name  # skip the name dialog when set
+        self.journal = None
+        if save:
+            from savegame import Journal
+            self.journal = Journal(save)
         self.player = None
+        self.scene = None
+        self.enemy_hp = 0
+        self.battle = None  # FleetBattle while a fleet combat is running
         self.typing_speed = 30  # milliseconds per character
-        self.current_text = ""
-        self.text_index = 0
+        self.frame_ms = 33  # milliseconds between typewriter frames
+        self.text_queue = deque()  # [text, typewriter] messages waiting to be shown
+        self.text_index = 0  # characters of the head message already shown
+        self.type_clock = 0.0
+        self.type_job = None
+        self.scrollback = scrollback  # story lines kept in the widget
+        self.trim_batch = max(1, scrollback // 10)  # lines dropped at once
+        self.archive = archive  # file that receives trimmed lines
+        self.archive_pages = []  # (offset, length) of each trimmed batch
+        self.choice_buttons = []  # pooled choice buttons, shown ones first
+        self.choices_shown = 0
+        self.choice_stats = {"created": 0, "reused": 0}
         
         self.setup_ui()
-        self.show_intro()
+        resumed = self.journal.resume() if self.journal else None
+        if resumed:
+            self.player, scene_id = resumed
+            self.update_stats()
+            self.add_text(f"Welcome back, Captain {self.player.name}. Resuming your mission...")
+            self.show_scene(self.engine.scene(scene_id))
+        else:
+            self.show_intro()
         
     def setup_ui(self):
         # Main container
@@ -95,6 +113,11 @@ class GameGUI:
         self.choices_frame = tk.Frame(main_frame, bg="#0a0e27")
         self.choices_frame.pack(fill=tk.X, pady=(10, 0))
         
+        # Skip the typewriter animation
+        self.root.bind("<Escape>", self.flush_text)
+        self.story_text.bind("<Button-1>", self.flush_text)
+        self.root.bind("<F2>", self.show_history)
+        
     def update_stats(self):
         if self.player:
             stats = f"Captain {self.player.name} | HP: {self.player.hp}/{self.player.max_hp} | Energy: {self.player.energy}"
@@ -105,62 +128,176 @@ class GameGUI:
             self.stats_label.config(text=stats)
         
     def add_text(self, text, delay=True):
-        """Add text to story area with optional typewriter effect"""
-        self.story_text.config(state=tk.NORMAL)
-        
-        if delay:
-            self.current_text = text + "\n\n"
-            self.text_index = 0
+        """Queue text for the story area with optional typewriter effect"""
+        self.text_queue.append((text + "\n\n", delay))
+        if self.type_job is None:
+            # Start the first character right away
+            self.type_clock = self.scheduler.now() - self.typing_speed / 1000
             self.type_character()
-        else:
-            self.story_text.insert(tk.END, text + "\n\n")
-            self.story_text.see(tk.END)
-            self.story_text.config(state=tk.DISABLED)
         
     def type_character(self):
-        """Typewriter effect for text"""
-        if self.text_index < len(self.current_text):
-            self.story_text.insert(tk.END, self.current_text[self.text_index])
-            self.story_text.see(tk.END)
-            self.text_index += 1
-            self.root.after(self.typing_speed, self.type_character)
-        else:
-            self.story_text.config(state=tk.DISABLED)
+        """Typewriter effect for queued text, inserting every character due this frame"""
+        self.type_job = None
+        now = self.scheduler.now()
+        budget = int((now - self.type_clock) * 1000 / self.typing_speed)
+        parts = []
+        
+        while self.text_queue:
+            text, delay = self.text_queue[0]
+            if not delay:
+                parts.append(text[self.text_index:])
+            elif budget > 0:
+                chunk = text[self.text_index:self.text_index + budget]
+                parts.append(chunk)
+                budget -= len(chunk)
+                self.type_clock += len(chunk) * self.typing_speed / 1000
+                self.text_index += len(chunk)
+                if self.text_index < len(text):
+                    break
+            else:
+                break
+            self.text_queue.popleft()
+            self.text_index = 0
+        
+        if not self.text_queue:
+            self.type_clock = now
+        self.insert_text("".join(parts))
+        if self.text_queue:
+            self.type_job = self.scheduler.after(self.frame_ms, self.type_character, "text")
+    
+    def flush_text(self, event=None):
+        """Show all queued text immediately"""
+        if self.type_job is not None:
+            self.scheduler.cancel_timer(self.type_job)
+            self.type_job = None
+        parts = [text[self.text_index if i == 0 else 0:] for i, (text, delay) in enumerate(self.text_queue)]
+        self.text_queue.clear()
+        self.text_index = 0
+        self.insert_text("".join(parts))
     
-    def clear_choices(self):
-        """Clear all choice buttons"""
-        for widget in self.choices_frame.winfo_children():
-            widget.destroy()
+    def insert_text(self, text):
+        """Append text to the story area and scroll to it"""
+        if not text:
+            return
+        self.story_text.config(state=tk.NORMAL)
+        self.story_text.insert(tk.END, text)
+        self.trim_scrollback()
+        self.story_text.see(tk.END)
+        self.story_text.config(state=tk.DISABLED)
     
-    def add_choice(self, text, command):
-        """Add a choice button"""
-        btn = tk.Button(
-            self.choices_frame,
-            text=text,
-            font=("Courier New", 10, "bold"),
-            bg="#1a4d2e",
+    def trim_scrollback(self):
+        """Drop the oldest story lines in batches once the scrollback limit is exceeded"""
+        lines = int(self.story_text.index("end-1c").split(".")[0])
+        if lines <= self.scrollback + self.trim_batch:
+            return
+        cut = f"{lines - self.scrollback + 1}.0"
+        if self.archive:
+            self.archive_text(self.story_text.get("1.0", cut))
+        self.story_text.delete("1.0", cut)
+    
+    def archive_text(self, text):
+        """Append trimmed story text to the archive file as one page"""
+        if not text:
+            return
+        data = text.encode("utf-8")
+        with open(self.archive, "ab") as f:
+            offset = f.tell()
+            f.write(data)
+        self.archive_pages.append((offset, len(data)))
+    
+    def read_archive_page(self, page):
+        """Read one archived page without loading the rest of the archive"""
+        offset, length = self.archive_pages[page]
+        with open(self.archive, "rb") as f:
+            f.seek(offset)
+            return f.read(length).decode("utf-8")
+    
+    def show_history(self, event=None):
+        """Page back through archived story text"""
+        if not self.archive_pages:
+            return
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Ship's Log")
+        dialog.geometry("700x500")
+        dialog.configure(bg="#0a0e27")
+        
+        log = tk.Text(
+            dialog,
+            wrap=tk.WORD,
+            font=("Courier New", 11),
+            bg="#0f1419",
             fg="#00ff88",
-            activebackground="#2d6a4f",
-            activeforeground="#00ff88",
-            relief=tk.RAISED,
-            bd=3,
-            padx=20,
-            pady=10,
-            command=command,
-            cursor="hand2"
+            relief=tk.FLAT,
+            padx=15,
+            pady=15
         )
+        log.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        nav = tk.Frame(dialog, bg="#0a0e27")
+        nav.pack(fill=tk.X, padx=10, pady=(0, 10))
+        page = [len(self.archive_pages) - 1]
+        
+        def show(index):
+            page[0] = max(0, min(index, len(self.archive_pages) - 1))
+            log.config(state=tk.NORMAL)
+            log.delete("1.0", tk.END)
+            log.insert(tk.END, self.read_archive_page(page[0]))
+            log.config(state=tk.DISABLED)
+            dialog.title(f"Ship's Log - page {page[0] + 1}/{len(self.archive_pages)}")
+        
+        for text, step in (("◀ Older", -1), ("Newer ▶", 1)):
+            tk.Button(
+                nav,
+                text=text,
+                font=("Courier New", 10, "bold"),
+                bg="#1a4d2e",
+                fg="#00ff88",
+                command=lambda step=step: show(page[0] + step)
+            ).pack(side=tk.LEFT if step < 0 else tk.RIGHT)
+        show(page[0])
+    
+    def clear_choices(self):
+        """Hide all choice buttons, keeping them for reuse"""
+        for btn in self.choice_buttons[:self.choices_shown]:
+            btn.pack_forget()
+        self.choices_shown = 0
+    
+    def add_choice(self, text, command):
+        """Add a choice button, reusing a pooled one when available"""
+        if self.choices_shown < len(self.choice_buttons):
+            btn = self.choice_buttons[self.choices_shown]
+            btn.config(text=text, command=command)
+            self.choice_stats["reused"] += 1
+        else:
+            btn = tk.Button(
+                self.choices_frame,
+                text=text,
+                font=("Courier New", 10, "bold"),
+                bg="#1a4d2e",
+                fg="#00ff88",
+                activebackground="#2d6a4f",
+                activeforeground="#00ff88",
+                relief=tk.RAISED,
+                bd=3,
+                padx=20,
+                pady=10,
+                command=command,
+                cursor="hand2"
+            )
+            self.choice_buttons.append(btn)
+            self.choice_stats["created"] += 1
         btn.pack(fill=tk.X, pady=5)
+        self.choices_shown += 1
         
     def show_intro(self):
         """Show game introduction"""
-        self.add_text("=" * 50)
-        self.add_text("STARSHIP ODYSSEY: The Lost Sector")
-        self.add_text("=" * 50)
-        self.add_text("\nYear 2347. Humanity has reached the stars...")
-        self.add_text("Your ship, the USS Wanderer, has detected a mysterious signal")
-        self.add_text("from Sector X-9, a region marked as 'Lost' on all star charts.\n")
+        for block in self.engine.intro():
+            for line in block:
+                self.add_text(line.strip("\n"))
         
-        self.root.after(3000, self.ask_name)
+        if self.captain_name:
+            self.scheduler.after(3000, lambda: self.begin(self.captain_name), "intro")
+        else:
+            self.scheduler.after(3000, self.ask_name, "intro")
     
     def ask_name(self):
         """Ask for player name"""
@@ -192,10 +329,8 @@ class GameGUI:
         def submit():
             name = name_entry.get().strip()
             if name:
-                self.player = Player(name)
-                self.update_stats()
                 dialog.destroy()
-                self.distress_signal()
+                self.begin(name)
             else:
                 messagebox.showwarning("Invalid Name", "Please enter a valid name!")
         
@@ -210,322 +345,159 @@ class GameGUI:
             command=submit
         ).pack(pady=10)
     
-    def distress_signal(self):
-        """First choice scene"""
-        self.clear_choices()
-        self.add_text("Your sensors pick up a distress signal from a nearby ship.")
-        self.add_text("Scans reveal it's damaged but might contain survivors... or danger.")
-        self.add_text("\nWhat do you do?")
-        
-        self.add_choice("1. Dock with the ship and investigate", self.investigate_ship)
-        self.add_choice("2. Send a probe to scan first", self.probe_scan)
-        self.add_choice("3. Ignore it and continue to the signal source", self.ignore_ship)
-    
-    def investigate_ship(self):
-        """Direct investigation path"""
-        self.clear_choices()
-        self.add_text("You dock with the damaged vessel. The airlock hisses open...")
-        self.add_text("Inside, emergency lights flicker. You hear movement ahead.")
-        
-        self.root.after(2000, self.investigate_choice)
-    
-    def investigate_choice(self):
-        self.add_text("\nWhat do you do?")
-        self.add_choice("1. Call out to identify yourself", self.call_out)
-        self.add_choice("2. Proceed cautiously with weapon drawn", self.combat_droid)
-        self.add_choice("3. Check the ship's computer first", self.check_computer)
-    
-    def call_out(self):
-        self.clear_choices()
-        self.add_text("A figure emerges - it's Dr. Sarah Chen, a xenobiologist!")
-        self.add_text("'Thank the stars! Our ship was attacked by unknown hostiles.'")
-        self.player.crew_members.append("Dr. Chen")
-        self.player.energy += 10
+    def begin(self, name):
+        """Start a new run for the named captain"""
+        self.player = Player(name)
         self.update_stats()
-        self.root.after(3000, self.ancient_artifact)
+        self.show_scene(self.engine.start)
+    
+    def after(self, ms, callback):
+        """Schedule a callback that belongs to the current scene"""
+        return self.scheduler.after(ms, callback, self.scene.id if self.scene else None)
     
-    def check_computer(self):
+    def show_scene(self, scene):
+        """Narrate a scene and schedule whatever comes after it"""
         self.clear_choices()
-        self.add_text("You access the computer. Logs show they found something...")
-        self.add_text("An artifact of unknown origin. It's still aboard!")
-        self.player.inventory.append("Ancient Map")
+        self.scene = scene
+        if self.journal:
+            self.journal.record(self.player, scene.id)
+        for line in self.engine.text(scene, self.player):
+            self.add_text(line.lstrip("\n"))  # the leading newlines space out the terminal version
+        self.engine.apply(scene, self.player)
         self.update_stats()
-        self.root.after(3000, self.ancient_artifact)
+        
+        if scene.ending is not None:
+            if self.journal:
+                self.journal.clear()
+            self.show_restart()
+        elif scene.combat:
+            self.enemy_hp = scene.combat.hp
+            self.battle = self.engine.fleet_battle(scene.combat, self.player)
+            self.after(scene.delay, self.combat_round)
+        elif scene.choices:
+            if scene.delay:
+                self.after(scene.delay, self.show_choices)
+            else:
+                self.show_choices()
+        else:
+            next_scene = self.engine.follow(scene, self.player)
+            self.after(scene.delay, lambda: self.show_scene(next_scene))
     
-    def combat_droid(self):
-        """Combat encounter"""
-        self.clear_choices()
-        self.droid_hp = 50
-        self.add_text("You round a corner and face a malfunctioning security droid!")
-        self.add_text("COMBAT INITIATED!")
-        self.root.after(2000, self.combat_round)
+    def show_choices(self):
+        """Offer the current scene's choices"""
+        scene = self.scene
+        self.add_text(f"\n{scene.prompt}")
+        for i, choice in enumerate(scene.choices, 1):
+            self.add_choice(f"{i}. {choice.label}",
+                            lambda number=i: self.show_scene(self.engine.follow(scene, self.player, number)))
     
     def combat_round(self):
         """Single combat round"""
-        if self.droid_hp <= 0:
-            self.add_text("\n✓ Droid defeated!")
-            self.add_text("You find a power cell in the wreckage.")
-            self.player.inventory.append("Power Cell")
-            self.update_stats()
-            self.root.after(3000, self.ancient_artifact)
-            return
-        
-        if self.player.hp <= 0:
-            self.game_over("The droid overwhelmed you...")
+        fight = self.scene.combat
+        if self.battle:
+            self.enemy_hp = self.battle.enemy.count()
+        result = self.engine.combat_result(fight, self.player, self.enemy_hp)
+        if result:
+            self.battle = None
+            self.show_scene(result)
             return
         
         self.clear_choices()
-        self.add_text(f"\nDroid HP: {self.droid_hp} | Your HP: {self.player.hp}")
+        if self.battle:
+            self.add_text(f"\n{self.battle.status()}")
+        else:
+            self.add_text(f"\n{fight.enemy} HP: {self.enemy_hp} | Your HP: {self.player.hp}")
         
-        self.add_choice("⚔️ Attack (20-30 damage)", lambda: self.combat_action("attack"))
-        self.add_choice("🛡️ Defend (Reduce incoming damage)", lambda: self.combat_action("defend"))
-        self.add_choice("💊 Use med-kit (Heal 25 HP)", lambda: self.combat_action("heal"))
+        for action, label, icon in self.engine.combat_actions:
+            self.add_choice(f"{icon} {label}", lambda action=action: self.combat_action(action))
     
     def combat_action(self, action):
         """Process combat action"""
         self.clear_choices()
-        
-        if action == "attack":
-            damage = random.randint(20, 30)
-            self.droid_hp -= damage
-            self.add_text(f"You attack for {damage} damage!", delay=False)
-            
-            if self.droid_hp > 0:
-                incoming = random.randint(15, 25)
-                self.player.take_damage(incoming)
-                self.add_text(f"Droid attacks for {incoming} damage!", delay=False)
-        
-        elif action == "defend":
-            self.add_text("You take a defensive stance!", delay=False)
-            incoming = random.randint(5, 10)
-            self.player.take_damage(incoming)
-            self.add_text(f"Droid attacks for {incoming} damage (reduced)!", delay=False)
-        
-        else:  # heal
-            self.player.heal(25)
-            self.add_text("You use a med-kit and heal 25 HP!", delay=False)
-            if self.droid_hp > 0:
-                incoming = random.randint(15, 25)
-                self.player.take_damage(incoming)
-                self.add_text(f"Droid attacks for {incoming} damage!", delay=False)
-        
-        self.update_stats()
-        self.root.after(1500, self.combat_round)
-    
-    def probe_scan(self):
-        """Probe scanning path"""
-        self.clear_choices()
-        self.add_text("You launch a probe. Scans reveal organic life signs...")
-        self.add_text("And something else - an energy signature unlike anything known.")
-        self.player.energy -= 5
-        self.update_stats()
-        
-        self.root.after(2000, self.probe_choice)
-    
-    def probe_choice(self):
-        self.add_text("\nWhat do you do?")
-        self.add_choice("1. Dock with the ship now that you know more", self.investigate_ship)
-        self.add_choice("2. Call for backup from the nearest station", self.backup_ending)
-        self.add_choice("3. Proceed directly to the main signal source", self.signal_source)
-    
-    def ignore_ship(self):
-        """Ignoring the distress signal"""
-        self.clear_choices()
-        self.add_text("You continue toward the main signal. Your crew looks uneasy.")
-        self.add_text("Suddenly, your ship shudders - you're caught in a tractor beam!")
-        self.player.hp -= 20
-        self.update_stats()
-        
-        self.root.after(2000, lambda: self.add_text("An alien vessel appears. They're scanning you..."))
-        self.root.after(4000, self.alien_encounter)
-    
-    def ancient_artifact(self):
-        """Artifact discovery scene"""
-        self.clear_choices()
-        self.add_text("You discover the ship's cargo bay. Inside...")
-        self.add_text("A crystalline artifact pulses with otherworldly energy!")
-        
-        self.root.after(2000, self.artifact_choice)
-    
-    def artifact_choice(self):
-        self.add_text("\nWhat do you do?")
-        self.add_choice("1. Take the artifact", self.take_artifact)
-        self.add_choice("2. Leave it and report your findings", self.safe_ending)
-        self.add_choice("3. Study it first with your scanner", self.study_artifact)
-    
-    def take_artifact(self):
-        self.clear_choices()
-        self.add_text("As you touch it, visions flood your mind!")
-        self.add_text("You see the location of an ancient alien gateway...")
-        self.player.inventory.append("Crystalline Artifact")
-        self.update_stats()
-        self.root.after(3000, self.gateway_choice)
-    
-    def study_artifact(self):
-        self.clear_choices()
-        self.add_text("Scans reveal it's a key of some kind...")
-        self.add_text("The main signal source - it's a lock mechanism!")
-        self.player.inventory.append("Crystalline Key")
-        self.update_stats()
-        self.root.after(3000, self.signal_source)
-    
-    def alien_encounter(self):
-        """Alien contact scene"""
-        self.clear_choices()
-        self.add_text("A voice speaks in perfect English:")
-        self.add_text("'We are the Keepers. You have found what was lost.'")
-        
-        self.root.after(2000, self.alien_choice)
-    
-    def alien_choice(self):
-        self.add_text("\nHow do you respond?")
-        self.add_choice("1. 'We come in peace' (Diplomatic)", self.peaceful_alien)
-        self.add_choice("2. 'Release us immediately!' (Aggressive)", self.aggressive_alien)
-        self.add_choice("3. 'What is this place?' (Curious)", self.curious_alien)
-    
-    def peaceful_alien(self):
-        self.clear_choices()
-        self.add_text("'Your peaceful nature is noted. We will guide you.'")
-        self.player.crew_members.append("Keeper Guide")
-        self.update_stats()
-        self.root.after(3000, self.gateway_choice)
-    
-    def aggressive_alien(self):
-        self.clear_choices()
-        self.add_text("'Hostility detected. Initiating defensive protocols.'")
-        self.player.hp -= 30
-        self.update_stats()
-        self.add_text("Your ship takes damage before you can apologize!")
-        self.root.after(3000, self.alien_encounter)
-    
-    def curious_alien(self):
-        self.clear_choices()
-        self.add_text("'This is the Gateway to the Lost Worlds. You may enter.'")
-        self.root.after(3000, self.gateway_choice)
-    
-    def signal_source(self):
-        """Main signal source"""
-        self.clear_choices()
-        self.add_text("You arrive at the signal source - a massive space station!")
-        self.add_text("It's older than human civilization itself.")
-        
-        if "Crystalline Key" in self.player.inventory or "Crystalline Artifact" in self.player.inventory:
-            self.add_text("\nYour artifact resonates with the station!")
-            self.root.after(3000, self.gateway_choice)
+        if self.battle:
+            messages = self.engine.fleet_turn(self.battle, self.player, action)
         else:
-            self.add_text("\nThe station's doors remain sealed. You need a key...")
-            self.root.after(3000, self.search_ending)
-    
-    def gateway_choice(self):
-        """Final major choice"""
-        self.clear_choices()
-        self.add_text("The gateway activates! It can transport you to:")
-        self.add_text("Ancient worlds, untouched by time...")
+            self.enemy_hp, messages = self.engine.combat_turn(self.scene.combat, self.player, self.enemy_hp, action)
+        for message in messages:
+            self.add_text(message.strip("\n"), delay=False)
         
-        self.root.after(2000, self.final_choice)
-    
-    def final_choice(self):
-        self.add_text("\nWhat is your decision?")
-        self.add_choice("1. Enter the gateway (The Unknown)", self.explorer_ending)
-        self.add_choice("2. Take readings and return home (Scientific Caution)", self.scientist_ending)
-        self.add_choice("3. Invite humanity to explore together (Diplomatic)", self.diplomat_ending)
-    
-    # ENDINGS
-    def explorer_ending(self):
-        self.clear_choices()
-        self.add_text("\n" + "=" * 50)
-        self.add_text("ENDING: THE EXPLORER")
-        self.add_text("=" * 50)
-        self.add_text("\nYou step through the gateway. Light surrounds you...")
-        self.add_text("On the other side, a new galaxy awaits.")
-        self.add_text("Your name will be remembered as the first to traverse the Lost Sector.")
-        self.add_text(f"\nCaptain {self.player.name}, your journey has just begun...")
-        self.show_restart()
-    
-    def scientist_ending(self):
-        self.clear_choices()
-        self.add_text("\n" + "=" * 50)
-        self.add_text("ENDING: THE SCIENTIST")
-        self.add_text("=" * 50)
-        self.add_text("\nYou collect invaluable data and return home.")
-        self.add_text("Your discoveries advance human understanding by centuries.")
-        self.add_text("The gateway remains, waiting for humanity to be ready.")
-        self.add_text(f"\nCaptain {self.player.name}, you have enlightened humanity!")
-        self.show_restart()
-    
-    def diplomat_ending(self):
-        self.clear_choices()
-        self.add_text("\n" + "=" * 50)
-        self.add_text("ENDING: THE DIPLOMAT")
-        self.add_text("=" * 50)
-        self.add_text("\nYou call for humanity to witness this moment together.")
-        self.add_text("The gateway becomes a symbol of unity and exploration.")
-        self.add_text("A new era of cooperation begins among the stars.")
-        self.add_text(f"\nCaptain {self.player.name}, you have united humanity!")
-        self.show_restart()
-    
-    def safe_ending(self):
-        self.clear_choices()
-        self.add_text("\n" + "=" * 50)
-        self.add_text("ENDING: THE CAUTIOUS COMMANDER")
-        self.add_text("=" * 50)
-        self.add_text("\nYou play it safe. The artifact is studied by experts.")
-        self.add_text("Your career is stable, but you'll always wonder...")
-        self.add_text("What mysteries lay beyond that signal?")
-        self.add_text(f"\nCaptain {self.player.name}, you survived, but at what cost?")
-        self.show_restart()
-    
-    def backup_ending(self):
-        self.clear_choices()
-        self.add_text("\n" + "=" * 50)
-        self.add_text("ENDING: THE ONE THAT GOT AWAY")
-        self.add_text("=" * 50)
-        self.add_text("\nThe signal vanishes before you can investigate.")
-        self.add_text("The mystery of Sector X-9 remains unsolved.")
-        self.add_text("Perhaps some secrets are meant to stay hidden...")
-        self.add_text(f"\nCaptain {self.player.name}, the stars keep their secrets.")
-        self.show_restart()
-    
-    def search_ending(self):
-        self.clear_choices()
-        self.add_text("\n" + "=" * 50)
-        self.add_text("ENDING: THE ENDLESS SEARCH")
-        self.add_text("=" * 50)
-        self.add_text("\nWithout the key, you cannot enter.")
-        self.add_text("You dedicate your life to finding another way in...")
-        self.add_text("The gateway taunts you with possibilities.")
-        self.add_text(f"\nCaptain {self.player.name}, your quest continues...")
-        self.show_restart()
-    
-    def game_over(self, reason):
-        """Game over"""
-        self.clear_choices()
-        self.add_text("\n" + "=" * 50)
-        self.add_text("GAME OVER")
-        self.add_text("=" * 50)
-        self.add_text(f"\n{reason}")
-        self.add_text(f"Captain {self.player.name} fell in the line of duty.")
-        self.add_text("The stars remember the brave...")
-        self.show_restart()
+        self.update_stats()
+        self.after(1500, self.combat_round)
     
     def show_restart(self):
         """Show restart button"""
-        self.root.after(3000, lambda: self.add_choice("🔄 Play Again", self.restart_game))
+        self.after(3000, lambda: self.add_choice("🔄 Play Again", self.restart_game))
+    
+    def choose(self, number):
+        """Press the numbered choice button, as a player would"""
+        if not 1 <= number <= self.choices_shown:
+            raise ValueError(f"No choice {number}; {self.choices_shown} shown")
+        self.choice_buttons[number - 1].invoke()
     
     def restart_game(self):
         """Restart the game"""
+        self.scheduler.cancel()
+        self.flush_text()
         self.story_text.config(state=tk.NORMAL)
+        if self.archive:
+            self.archive_text(self.story_text.get("1.0", "end-1c"))
         self.story_text.delete(1.0, tk.END)
         self.story_text.config(state=tk.DISABLED)
         self.clear_choices()
         self.player = None
+        self.scene = None
+        self.battle = None
         self.stats_label.config(text="")
         self.show_intro()
 
-def main():
+def autoplay(answers, name="Tester", root=None, seed=None):
+    """Play a whole GUI game on a virtual clock, pressing the given choices in order"""
+    root = root or tk.Tk()
+    scheduler = Scheduler(root, virtual=True)
+    game = GameGUI(root, scheduler=scheduler, name=name, seed=seed)
+    for number in answers:
+        scheduler.run()
+        game.choose(number)
+    scheduler.run()
+    return game
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Starship Odyssey: The Lost Sector")
+    parser.add_argument("--scrollback", type=int, default=2000, help="story lines kept on screen")
+    parser.add_argument("--archive", metavar="PATH", help="save trimmed story text here (F2 pages back)")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="multiply every delay (0.5 = twice as fast)")
+    parser.add_argument("--save", metavar="PATH", help="autosave here and resume from it on the next start")
+    parser.add_argument("--language", default="en", help="text pack to play in (see text/)")
+    parser.add_argument("--sector", type=int, default=0, metavar="SYSTEMS",
+                        help="navigate a generated sector of this many systems to reach the signal")
+    parser.add_argument("--fleet", type=int, default=0, metavar="SHIPS",
+                        help="fight every combat with this many ships per side (needs NumPy)")
+    parser.add_argument("--telemetry", metavar="PATH", help="log choices, combat and endings here (see telemetry.py)")
+    parser.add_argument("--trace", metavar="PATH", help="write a per-scene time breakdown as JSON")
+    parser.add_argument("--trace-chrome", metavar="PATH", help="write a Chrome trace-event file")
+    args = parser.parse_args(argv)
+    
+    tracer = None
+    if args.trace or args.trace_chrome:
+        from instrument import Tracer
+        tracer = Tracer()
+        tracer.install_gui(GameGUI)
+    telemetry = None
+    if args.telemetry:
+        from telemetry import Telemetry
+        telemetry = Telemetry(args.telemetry)
     root = tk.Tk()
-    game = GameGUI(root)
-    root.mainloop()
+    game = GameGUI(root, scrollback=args.scrollback, archive=args.archive,
+                   scheduler=Scheduler(root, time_scale=args.time_scale), save=args.save,
+                   language=args.language, systems=args.sector, fleet=args.fleet, telemetry=telemetry)
+    try:
+        root.mainloop()
+    finally:
+        if telemetry:
+            telemetry.close()
+        if tracer:
+            tracer.restore()
+            tracer.save(args.trace, args.trace_chrome)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,188 @@
+"""Opt-in latency instrumentation for both frontends
+
+A Tracer wraps the frontends' scene functions, GUI callbacks, typewriter and
+I/O entry points in timing spans, and splits each scene's time into:
+
+    logic   - scene functions and GUI callbacks themselves
+    pacing  - typewriter reveal and dramatic pauses (slow_print, pause,
+              type_character, flush_text)
+    io      - writes and flushes to the terminal, inserts into the Tk widget
+    input   - waiting for the player to type or click
+
+Spans nest, and each one is charged only its own time, so a slow turn shows
+up in the category that caused it. Nothing is patched until install_* is
+called, so the frontends run untouched when tracing is off.
+
+    python terminal_game.py --trace turns.json --trace-chrome turns.trace.json
+
+The Chrome trace opens in chrome://tracing or Perfetto.
+"""
+import functools
+import json
+import sys
+import time
+
+CATEGORIES = ("logic", "pacing", "io", "input")
+
+
+class _TimedStream:
+    """stdout proxy that times every write and flush"""
+
+    def __init__(self, stream, tracer):
+        self._stream = stream
+        self.write = tracer.wrap(stream.write, "stdout.write", "io")
+        self.flush = tracer.wrap(stream.flush, "stdout.flush", "io")
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class Tracer:
+    """Collects nested timing spans, attributed to the scene being played"""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.origin = clock()
+        self.events = []  # (name, category, scene, start, duration, self time, thread)
+        self.stack = []  # [start, time spent in child spans]
+        self.scene = None
+        self.waiting = None  # GUI: when choices were offered
+        self.patched = []  # (owner, attribute, original)
+
+    def wrap(self, func, name, category, scene_arg=None):
+        """Return func timed as a span; scene_arg picks the argument holding a Scene"""
+        tracer = self
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            if scene_arg is not None:
+                tracer.scene = args[scene_arg].id
+            scene = tracer.scene
+            frame = [tracer.clock(), 0.0]
+            tracer.stack.append(frame)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end = tracer.clock()
+                tracer.stack.pop()
+                duration = end - frame[0]
+                if tracer.stack:
+                    tracer.stack[-1][1] += duration
+                tracer.events.append((name, category, scene, frame[0], duration, duration - frame[1], 1))
+        return timed
+
+    def patch(self, owner, attribute, category, scene_arg=None, name=None):
+        """Replace owner.attribute with a timed version until restore()"""
+        original = getattr(owner, attribute)
+        label = name or f"{getattr(owner, '__name__', type(owner).__name__)}.{attribute}"
+        self.patched.append((owner, attribute, original))
+        setattr(owner, attribute, self.wrap(original, label, category, scene_arg))
+
+    def restore(self):
+        """Undo every patch, newest first"""
+        while self.patched:
+            owner, attribute, original = self.patched.pop()
+            setattr(owner, attribute, original)
+
+    # Input waits in the GUI have no blocking call to time, so they are marked
+
+    def wait_start(self):
+        self.waiting = self.clock()
+
+    def wait_end(self):
+        if self.waiting is None:
+            return
+        duration = self.clock() - self.waiting
+        self.events.append(("wait for player", "input", self.scene, self.waiting, duration, duration, 2))
+        self.waiting = None
+
+    def install_terminal(self, terminal_game=None):
+        """Instrument terminal_game (or the module given) and its typewriter"""
+        if terminal_game is None:
+            import terminal_game
+        self.patch(terminal_game, "play_scene", "logic", scene_arg=1)
+        self.patch(terminal_game, "print_stats", "logic")
+        self.patch(terminal_game, "slow_print", "pacing")
+        self.patch(terminal_game, "pause", "pacing")
+        self.patch(terminal_game, "read_line", "input")
+        self.patch(terminal_game.typewriter, "write", "io", name="typewriter.write")
+        self.patched.append((sys, "stdout", sys.stdout))
+        sys.stdout = _TimedStream(sys.stdout, self)
+
+    def install_gui(self, cls=None):
+        """Instrument GameGUI callbacks, the render queue and player waits"""
+        if cls is None:
+            from gui_game import GameGUI as cls
+        self.patch(cls, "show_scene", "logic", scene_arg=1)
+        for attribute in ("show_intro", "show_choices", "combat_round", "combat_action",
+                          "show_restart", "begin", "restart_game", "add_text", "clear_choices", "add_choice"):
+            self.patch(cls, attribute, "logic")
+        for attribute in ("type_character", "flush_text"):
+            self.patch(cls, attribute, "pacing")
+        for attribute in ("insert_text", "update_stats"):
+            self.patch(cls, attribute, "io")
+
+        # A button going up starts a wait; the click that answers it ends it
+        self._hook(cls, "add_choice", after=lambda game: self.wait_start())
+        for attribute in ("show_scene", "combat_action", "begin", "restart_game"):
+            self._hook(cls, attribute, before=lambda game: self.wait_end())
+
+    def _hook(self, owner, attribute, before=None, after=None):
+        original = getattr(owner, attribute)
+
+        @functools.wraps(original)
+        def hooked(game, *args, **kwargs):
+            if before:
+                before(game)
+            result = original(game, *args, **kwargs)
+            if after:
+                after(game)
+            return result
+        self.patched.append((owner, attribute, original))
+        setattr(owner, attribute, hooked)
+
+    # Reports
+
+    def breakdown(self):
+        """Per-scene and total milliseconds in each category, plus per-span stats"""
+        scenes = {}
+        spans = {}
+        totals = dict.fromkeys(CATEGORIES, 0.0)
+        for name, category, scene, start, duration, own, thread in self.events:
+            row = scenes.setdefault(scene or "(none)", dict.fromkeys(CATEGORIES, 0.0))
+            row[category] += own * 1000
+            totals[category] += own * 1000
+            span = spans.setdefault(name, {"category": category, "calls": 0, "total_ms": 0.0, "self_ms": 0.0})
+            span["calls"] += 1
+            span["total_ms"] += duration * 1000
+            span["self_ms"] += own * 1000
+        for row in list(scenes.values()) + [totals]:
+            row["total"] = sum(row[category] for category in CATEGORIES)
+        return {"scenes": scenes, "totals": totals, "spans": spans, "events": len(self.events)}
+
+    def chrome_trace(self):
+        """Events in Chrome trace-event format (complete "X" events, microseconds)"""
+        return {
+            "displayTimeUnit": "ms",
+            "traceEvents": [
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start - self.origin) * 1e6,
+                    "dur": duration * 1e6,
+                    "pid": 1,
+                    "tid": thread,
+                    "args": {"scene": scene},
+                }
+                for name, category, scene, start, duration, own, thread in self.events
+            ],
+        }
+
+    def save(self, path=None, chrome_path=None):
+        if path:
+            with open(path, "w") as f:
+                json.dump(self.breakdown(), f, indent=2)
+        if chrome_path:
+            with open(chrome_path, "w") as f:
+                json.dump(self.chrome_trace(), f)
@@ -0,0 +1,81 @@
+"""Single launcher for Starship Odyssey
+
+Imports only the frontend that was asked for: tkinter is never loaded for
+terminal play. Every other flag is passed through to the frontend.
+
+    python play.py [terminal flags]
+    python play.py --gui [GUI flags]
+    python play.py --startup-time --text instant < /dev/null
+
+--startup-time prints to stderr how long the launcher took to import the
+frontend, load the story bundle and show its first line of text.
+"""
+import sys
+import time
+
+START = time.perf_counter()
+
+
+class _FirstWrite:
+    """stdout proxy that reports the first write, then gets out of the way"""
+
+    def __init__(self, stream, report):
+        self.stream = stream
+        self.report = report
+
+    def write(self, text):
+        sys.stdout = self.stream
+        self.report("first text")
+        return self.stream.write(text)
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    gui = "--gui" in argv
+    timing = "--startup-time" in argv
+    argv = [arg for arg in argv if arg not in ("--gui", "--startup-time")]
+    marks = []
+
+    def mark(label):
+        marks.append((label, (time.perf_counter() - START) * 1000))
+        if timing and label == "first text":
+            report(marks)
+
+    modules = len(sys.modules)
+    if gui:
+        import gui_game as frontend
+        entry = frontend.main
+    else:
+        import terminal_game as frontend
+        entry = frontend.cli
+    mark(f"imported {frontend.__name__} (+{len(sys.modules) - modules} modules)")
+
+    if timing:
+        if gui:
+            insert_text = frontend.GameGUI.insert_text
+
+            def first_insert(game, text):
+                frontend.GameGUI.insert_text = insert_text
+                mark("first text")
+                return insert_text(game, text)
+            frontend.GameGUI.insert_text = first_insert
+        else:
+            sys.stdout = _FirstWrite(sys.stdout, mark)
+    entry(argv)
+
+
+def report(marks):
+    import bundle
+    print(f"startup: story bundle {bundle.stats['cache']} in {bundle.stats['ms']:.2f} ms", file=sys.stderr)
+    for label, ms in marks:
+        print(f"startup: {ms:8.2f} ms  {label}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except (EOFError, KeyboardInterrupt):
+        pass
@@ -0,0 +1,161 @@
+"""Deterministic record and replay of terminal sessions
+
+A session is the RNG seed plus every line the player typed. Replaying feeds
+the same lines back into the same scene logic with all pacing turned off,
+then checks that the transcript and the final Player match the recording.
+
+    python replay.py --record session.json
+    python replay.py session.json [more.json ...]
+"""
+import argparse
+import hashlib
+import io
+import json
+import random
+import sys
+import time
+
+import terminal_game
+from typewriter import MODES
+
+VERSION = 1
+
+
+class Tee:
+    """stdout wrapper that hashes everything written through it"""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.digest = hashlib.sha256()
+        self.chars = 0
+
+    def write(self, text):
+        self.digest.update(text.encode("utf-8"))
+        self.chars += len(text)
+        if self.stream is not None:
+            self.stream.write(text)
+
+    def flush(self):
+        if self.stream is not None:
+            self.stream.flush()
+
+
+def player_state(player):
+    if player is None:
+        return None
+    return {
+        "name": player.name,
+        "hp": player.hp,
+        "max_hp": player.max_hp,
+        "energy": player.energy,
+        "inventory": list(player.inventory),
+        "crew_members": list(player.crew_members),
+    }
+
+
+def _run(read_line, seed, stream=None):
+    """Run main() with the given input source and stdout; returns (tee, player)"""
+    tee = Tee(stream)
+    saved = sys.stdout, terminal_game.read_line
+    # Without a fileno input() writes its prompt through sys.stdout, so it lands in the transcript
+    sys.stdout = tee
+    terminal_game.read_line = read_line
+    player = None
+    try:
+        player = terminal_game.main(seed=seed)
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        sys.stdout, terminal_game.read_line = saved
+    return tee, player
+
+
+def record(path, seed=None):
+    """Play a normal session and save it for replay"""
+    seed = random.randrange(2 ** 32) if seed is None else seed
+    inputs = []
+
+    def read_line(prompt=""):
+        line = terminal_game.typewriter.read_line(prompt)
+        inputs.append(line)
+        return line
+
+    tee, player = _run(read_line, seed, sys.stdout)
+    session = {
+        "version": VERSION,
+        "seed": seed,
+        "inputs": inputs,
+        "transcript": {"sha256": tee.digest.hexdigest(), "chars": tee.chars},
+        "player": player_state(player),
+    }
+    with open(path, "w") as f:
+        json.dump(session, f, indent=2)
+    return session
+
+
+def replay(session, show=False):
+    """Replay a recorded session at full speed; returns a list of mismatches"""
+    if session.get("version") != VERSION:
+        return [f"unsupported session version {session.get('version')}"]
+    lines = iter(session["inputs"])
+
+    def read_line(prompt=""):
+        sys.stdout.write(prompt)
+        try:
+            return next(lines)
+        except StopIteration:
+            raise EOFError from None
+
+    mode = terminal_game.typewriter.mode
+    terminal_game.typewriter.mode = "instant"
+    try:
+        tee, player = _run(read_line, session["seed"], sys.stdout if show else io.StringIO())
+    finally:
+        terminal_game.typewriter.mode = mode
+
+    problems = []
+    expected = session["transcript"]
+    if tee.digest.hexdigest() != expected["sha256"]:
+        problems.append(f"transcript differs ({tee.chars} chars, recorded {expected['chars']})")
+    state = player_state(player)
+    if state != session["player"]:
+        problems.append(f"final player differs: {state} != {session['player']}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or replay Starship Odyssey sessions")
+    parser.add_argument("sessions", nargs="*", help="session JSON files to replay")
+    parser.add_argument("--record", metavar="PATH", help="play a session and save it here")
+    parser.add_argument("--seed", type=int, default=None, help="RNG seed for --record")
+    parser.add_argument("--text", choices=MODES, default="typewriter", help="text reveal while recording")
+    parser.add_argument("--show", action="store_true", help="print the replayed transcript")
+    args = parser.parse_args()
+
+    if args.record:
+        terminal_game.typewriter.mode = args.text
+        record(args.record, args.seed)
+        return
+    if not args.sessions:
+        parser.error("give session files to replay, or --record PATH")
+
+    failed = 0
+    start = time.perf_counter()
+    for path in args.sessions:
+        with open(path) as f:
+            problems = replay(json.load(f), args.show)
+        if problems:
+            failed += 1
+            print(f"FAIL {path}")
+            for problem in problems:
+                print(f"     {problem}")
+        else:
+            print(f"ok   {path}")
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{len(args.sessions) - failed}/{len(args.sessions)} sessions replayed identically in {elapsed:.2f}s")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
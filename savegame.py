@@ -0,0 +1,275 @@
+"""Compact binary save games and an append-only autosave journal
+
+A save holds the Player (name, hp, max_hp, energy, inventory, crew_members)
+and the scene to resume at. Records are varint-encoded and checksummed:
+
+    file    = MAGIC VERSION record*
+    record  = kind length payload crc32
+
+A snapshot record holds the full state; a delta record only what changed
+since the previous record. Autosave appends one delta per scene, rewrites
+the file as a single snapshot every `compact_every` records, and resume
+replays the latest snapshot plus the deltas after it. A record cut short by
+a crash is ignored.
+"""
+import os
+import struct
+import zlib
+
+from engine import Player
+
+MAGIC = b"SOSV"
+VERSION = 1
+
+SNAPSHOT, DELTA = 1, 2
+
+# Delta fields
+SCENE, NAME, HP, MAX_HP, ENERGY, ADD_ITEM, ADD_CREW, SET_ITEMS, SET_CREW = range(1, 10)
+
+
+class SaveError(ValueError):
+    """Raised for files that are not valid saves"""
+
+
+def _varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _signed(value):
+    return _varint((value << 1) ^ (value >> 63))
+
+
+def _string(text):
+    data = text.encode("utf-8")
+    return _varint(len(data)) + data
+
+
+def _strings(items):
+    return _varint(len(items)) + b"".join(_string(item) for item in items)
+
+
+class _Reader:
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def varint(self):
+        shift = result = 0
+        while True:
+            if self.pos >= len(self.data):
+                raise SaveError("Truncated varint")
+            byte = self.data[self.pos]
+            self.pos += 1
+            result |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return result
+            shift += 7
+
+    def signed(self):
+        value = self.varint()
+        return (value >> 1) ^ -(value & 1)
+
+    def string(self):
+        length = self.varint()
+        data = self.data[self.pos:self.pos + length]
+        if len(data) != length:
+            raise SaveError("Truncated string")
+        self.pos += length
+        return data.decode("utf-8")
+
+    def strings(self):
+        return [self.string() for _ in range(self.varint())]
+
+    def done(self):
+        return self.pos >= len(self.data)
+
+
+def state_of(player, scene_id):
+    """Plain tuple copy of everything a save records"""
+    return (scene_id, player.name, player.hp, player.max_hp, player.energy,
+            tuple(player.inventory), tuple(player.crew_members))
+
+
+def encode_snapshot(state):
+    scene_id, name, hp, max_hp, energy, inventory, crew = state
+    return (_string(scene_id) + _string(name) + _signed(hp) + _signed(max_hp)
+            + _signed(energy) + _strings(inventory) + _strings(crew))
+
+
+def decode_snapshot(payload):
+    reader = _Reader(payload)
+    return (reader.string(), reader.string(), reader.signed(), reader.signed(),
+            reader.signed(), tuple(reader.strings()), tuple(reader.strings()))
+
+
+def encode_delta(old, new):
+    """Encode only the fields of `new` that differ from `old`"""
+    out = bytearray()
+    for field, index in ((SCENE, 0), (NAME, 1)):
+        if old[index] != new[index]:
+            out += _varint(field) + _string(new[index])
+    for field, index in ((HP, 2), (MAX_HP, 3), (ENERGY, 4)):
+        if old[index] != new[index]:
+            out += _varint(field) + _signed(new[index] - old[index])
+    for add, replace, index in ((ADD_ITEM, SET_ITEMS, 5), (ADD_CREW, SET_CREW, 6)):
+        before, after = old[index], new[index]
+        if before == after:
+            continue
+        if after[:len(before)] == before:
+            for item in after[len(before):]:
+                out += _varint(add) + _string(item)
+        else:
+            out += _varint(replace) + _strings(after)
+    return bytes(out)
+
+
+def apply_delta(state, payload):
+    scene_id, name, hp, max_hp, energy, inventory, crew = state
+    reader = _Reader(payload)
+    while not reader.done():
+        field = reader.varint()
+        if field == SCENE:
+            scene_id = reader.string()
+        elif field == NAME:
+            name = reader.string()
+        elif field == HP:
+            hp += reader.signed()
+        elif field == MAX_HP:
+            max_hp += reader.signed()
+        elif field == ENERGY:
+            energy += reader.signed()
+        elif field == ADD_ITEM:
+            inventory += (reader.string(),)
+        elif field == ADD_CREW:
+            crew += (reader.string(),)
+        elif field == SET_ITEMS:
+            inventory = tuple(reader.strings())
+        elif field == SET_CREW:
+            crew = tuple(reader.strings())
+        else:
+            raise SaveError(f"Unknown delta field: {field}")
+    return scene_id, name, hp, max_hp, energy, inventory, crew
+
+
+def restore(state):
+    """Build a Player from a state tuple; returns (player, scene_id)"""
+    scene_id, name, hp, max_hp, energy, inventory, crew = state
+    player = Player(name)
+    player.hp = hp
+    player.max_hp = max_hp
+    player.energy = energy
+    player.inventory = list(inventory)
+    player.crew_members = list(crew)
+    return player, scene_id
+
+
+def _record(kind, payload):
+    body = bytes([kind]) + _varint(len(payload)) + payload
+    return body + struct.pack("<I", zlib.crc32(body))
+
+
+def _records(data):
+    """Yield (kind, payload) for every intact record after the header"""
+    if data[:4] != MAGIC:
+        raise SaveError("Not a Starship Odyssey save")
+    if len(data) < 5 or data[4] != VERSION:
+        raise SaveError(f"Unsupported save version: {data[4:5].hex() or 'missing'}")
+    pos = 5
+    while pos < len(data):
+        reader = _Reader(data)
+        reader.pos = pos + 1
+        try:
+            length = reader.varint()
+        except SaveError:
+            return
+        end = reader.pos + length
+        if end + 4 > len(data):
+            return
+        body = data[pos:end]
+        if struct.unpack("<I", data[end:end + 4])[0] != zlib.crc32(body):
+            return
+        yield data[pos], data[reader.pos:end]
+        pos = end + 4
+
+
+def read_state(path):
+    """Latest state in a save or journal file: last snapshot plus its tail of deltas"""
+    with open(path, "rb") as f:
+        data = f.read()
+    state = None
+    for kind, payload in _records(data):
+        if kind == SNAPSHOT:
+            state = decode_snapshot(payload)
+        elif kind == DELTA and state is not None:
+            state = apply_delta(state, payload)
+    if state is None:
+        raise SaveError("Save holds no snapshot")
+    return state
+
+
+def _write_snapshot(path, state):
+    """Write a one-snapshot file atomically"""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + bytes([VERSION]) + _record(SNAPSHOT, encode_snapshot(state)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def save(path, player, scene_id):
+    """Save a game to `path`"""
+    _write_snapshot(path, state_of(player, scene_id))
+
+
+def load(path):
+    """Load a game; returns (player, scene_id)"""
+    return restore(read_state(path))
+
+
+class Journal:
+    """Append-only autosave: one small delta per scene, compacted now and then"""
+
+    def __init__(self, path, compact_every=64):
+        self.path = path
+        self.compact_every = compact_every
+        self.state = None
+        self.records = 0
+
+    def resume(self):
+        """Load the journal's latest state, or None when there is nothing to resume"""
+        try:
+            self.state = read_state(self.path)
+        except (FileNotFoundError, SaveError):
+            return None
+        self.records = self.compact_every  # compact on the next write
+        return restore(self.state)
+
+    def record(self, player, scene_id):
+        """Autosave the player as they enter a scene"""
+        state = state_of(player, scene_id)
+        if self.state is None or self.records >= self.compact_every:
+            _write_snapshot(self.path, state)
+            self.records = 1
+        elif state != self.state:
+            with open(self.path, "ab") as f:
+                f.write(_record(DELTA, encode_delta(self.state, state)))
+            self.records += 1
+        self.state = state
+
+    def clear(self):
+        """Forget the run, e.g. once an ending is reached"""
+        self.state = None
+        self.records = 0
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,76 @@
+"""Central timer scheduler for the GUI
+
+Every delayed callback in the GUI goes through a Scheduler instead of raw
+root.after, so pending timers can be cancelled per scene or all at once,
+scaled by a global factor, or run on a virtual clock that fast-forwards a
+whole playthrough without waiting.
+"""
+import heapq
+import itertools
+import time
+
+
+class Scheduler:
+    """Owns every pending timer, tagged by the scene that scheduled it"""
+
+    def __init__(self, root=None, time_scale=1.0, virtual=False):
+        if time_scale <= 0:
+            raise ValueError("time_scale must be positive")
+        self.root = root
+        self.time_scale = time_scale  # 0.5 runs every delay twice as fast
+        self.virtual = virtual
+        self.clock = 0.0  # virtual time in seconds
+        self.start = time.monotonic()
+        self.pending = {}  # timer id -> (tag, Tk job or None)
+        self.queue = []  # virtual mode: (due, timer id, callback)
+        self.ids = itertools.count(1)
+
+    def now(self):
+        """Game time in seconds, following the time scale or the virtual clock"""
+        if self.virtual:
+            return self.clock
+        return (time.monotonic() - self.start) / self.time_scale
+
+    def after(self, ms, callback, tag=None):
+        """Run callback after `ms` milliseconds of game time; returns a timer id"""
+        timer = next(self.ids)
+        if self.virtual:
+            heapq.heappush(self.queue, (self.clock + ms / 1000, timer, callback))
+            self.pending[timer] = (tag, None)
+        else:
+            job = self.root.after(int(ms * self.time_scale), lambda: self._fire(timer, callback))
+            self.pending[timer] = (tag, job)
+        return timer
+
+    def _fire(self, timer, callback):
+        if self.pending.pop(timer, None) is not None:
+            callback()
+
+    def cancel_timer(self, timer):
+        """Cancel a single timer"""
+        entry = self.pending.pop(timer, None)
+        if entry and entry[1] is not None:
+            self.root.after_cancel(entry[1])
+
+    def cancel(self, tag=None):
+        """Cancel every pending timer, or only those with the given tag"""
+        for timer, (timer_tag, job) in list(self.pending.items()):
+            if tag is None or timer_tag == tag:
+                self.cancel_timer(timer)
+
+    def run(self, until=None):
+        """Virtual mode: fire due timers in order until none are left (or `until` seconds)"""
+        fired = 0
+        while self.queue:
+            due, timer, callback = self.queue[0]
+            if until is not None and due > until:
+                break
+            heapq.heappop(self.queue)
+            if timer not in self.pending:
+                continue
+            self.clock = max(self.clock, due)
+            self._fire(timer, callback)
+            fired += 1
+        if until is not None:
+            self.clock = max(self.clock, until)
+        return fired
@@ -0,0 +1,269 @@
+"""Full-screen ANSI layout for the terminal game, redrawn by diffing
+
+The terminal is split into three panes that stay put:
+
+    status  - captain, HP, energy, inventory and crew
+    story   - narration, scrolling inside its own region
+    choices - the current prompt, numbered options, notices and input
+
+Everything is drawn into an in-memory grid of rows. render() compares it
+with what the terminal already shows and only sends the changed span of
+each changed row; when the story scrolls, the terminal scrolls the story
+region itself (a DECSTBM scrolling region and line feeds) instead of having
+every row rewritten, and text typed onto the end of a row needs no cursor
+movement at all. Each
+render is a single write and flush. `bytes` counts everything sent, so the
+saving over plain output can be measured.
+
+Screen doubles as the story stream: with sys.stdout pointing at it, slow_print
+and the typewriter write straight into the story pane.
+"""
+import shutil
+import signal
+import sys
+
+ESC = "\x1b["
+CHOICE_ROWS = 9  # prompt, up to 5 options, notice, input, and a spare row for the echoed newline
+MIN_ROWS = 16
+MIN_COLUMNS = 40
+
+
+def fits(stream=None):
+    """Whether the terminal is interactive and big enough for the layout"""
+    stream = stream or sys.stdout
+    try:
+        if not stream.isatty():
+            return False
+    except (AttributeError, ValueError):
+        return False
+    columns, rows = shutil.get_terminal_size()
+    return rows >= MIN_ROWS and columns >= MIN_COLUMNS
+
+
+class Screen:
+    """Status, story and choice panes over one ANSI terminal"""
+
+    def __init__(self, stream=None, size=None, scrollback=500):
+        self.out = stream or sys.stdout
+        self.fixed_size = size
+        self.scrollback = scrollback
+        self.lines = []  # finished story lines as written, so they can be wrapped to any width
+        self.wrapped = []  # the same lines wrapped to the current width, one entry per row
+        self.current = ""  # story line still being written
+        self.finished = 0  # story rows ever finished; with the current line's rows, the scroll position
+        self.shown = 0  # scroll position at the last render
+        self.resized = False  # set by SIGWINCH; the next render lays the screen out again
+        self.status_rows = ["", "", ""]
+        self.prompt = ""
+        self.options = []
+        self.notice = ""
+        self.input_prompt = ""
+        self.keys = None  # typewriter.KeyWatch holding keys typed ahead, if any
+        self.bytes = 0
+        self.renders = 0
+        self.active = False
+        self._layout()
+
+    def _layout(self):
+        self.columns, self.rows = self.fixed_size or shutil.get_terminal_size()
+        self.story_top = len(self.status_rows) + 1
+        self.story_rows = self.rows - self.story_top - CHOICE_ROWS - 1
+        self.choice_top = self.story_top + self.story_rows + 1
+        self.input_row = self.choice_top + CHOICE_ROWS - 2
+        # Only the story pane scrolls; Enter on the input row below it never moves the screen
+        self.region = f"{ESC}{self.story_top + 1};{self.story_top + self.story_rows}r"
+        self.front = [None] * self.rows  # what the terminal shows; None = unknown
+        self.cursor = None  # (row, column) the terminal's cursor is at, when known
+
+    # Terminal setup
+
+    def __enter__(self):
+        self.active = True
+        self._send(f"{ESC}?1049h{ESC}2J{self.region}{ESC}?25l")  # alternate screen, cleared, no cursor
+        self._cleared()
+        if hasattr(signal, "SIGWINCH") and self.fixed_size is None:
+            self._winch = signal.signal(signal.SIGWINCH, self._resize)
+        self.render()
+        return self
+
+    def __exit__(self, *exc):
+        if hasattr(signal, "SIGWINCH") and self.fixed_size is None:
+            signal.signal(signal.SIGWINCH, self._winch)
+        self._send(f"{ESC}r{ESC}?25h{ESC}?1049l")
+        self.active = False
+
+    def _resize(self, signum=None, frame=None):
+        # Only note it: the signal can arrive in the middle of a render
+        self.resized = True
+
+    def _relayout(self):
+        self.resized = False
+        self._layout()
+        self.wrapped = [row for line in self.lines for row in self._wrap(line)][-self.scrollback:]
+        self._send(f"{ESC}2J{self.region}")
+        self._cleared()
+        self.shown = self._position()  # everything is redrawn, nothing to scroll
+
+    def _cleared(self):
+        self.front = [" " * self.columns for _ in range(self.rows)]
+        self.cursor = None
+
+    def _wrap(self, line):
+        return [line[i:i + self.columns] for i in range(0, max(len(line), 1), self.columns)]
+
+    def _position(self):
+        return self.finished + len(self._wrap(self.current))
+
+    # Pane contents
+
+    def status(self, player):
+        rows = [f"Captain {player.name} | HP: {player.hp}/{player.max_hp} | Energy: {player.energy}",
+                f"Inventory: {', '.join(player.inventory) or '-'}",
+                f"Crew: {', '.join(player.crew_members) or '-'}"]
+        if rows != self.status_rows:
+            self.status_rows = rows
+            self.render()
+
+    def choices(self, prompt, options):
+        self.prompt = prompt
+        self.options = list(options)
+        self.notice = ""
+        self.render()
+
+    def say(self, notice):
+        """Show a one-line message in the choice pane, e.g. an invalid entry"""
+        self.notice = notice
+        self.render()
+
+    def write(self, text):
+        """Append text to the story pane (file-like, so it can stand in for stdout)"""
+        if self.options and text:  # the story has moved on from the last choice
+            self.prompt, self.options, self.notice = "", [], ""
+        for char in text:
+            if char == "\n":
+                self._newline()
+            elif char != "\r":
+                self.current += char
+        if self.active:
+            self.render()
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False  # never ask for key input through the story pane
+
+    def _newline(self):
+        rows = self._wrap(self.current)
+        self.lines.append(self.current)
+        self.wrapped += rows
+        self.finished += len(rows)
+        self.current = ""
+        if len(self.lines) > self.scrollback:
+            del self.lines[:len(self.lines) - self.scrollback]
+        if len(self.wrapped) > self.scrollback:
+            del self.wrapped[:len(self.wrapped) - self.scrollback]
+
+    def read_line(self, prompt=""):
+        """Read a line typed into the input row, like input()"""
+        self.input_prompt = prompt.strip("\n")
+        self.render()
+        self.park()
+        if self.keys and self.keys.interactive():
+            line = self.keys.read_line(self._echo) + "\n"
+        else:
+            line = sys.stdin.readline()
+        self.input_prompt = ""
+        self.cursor = None
+        self._send(f"{ESC}?25l")
+        # The terminal echoed the typing and moved down a row; forget what those rows show
+        self.front[self.input_row] = None
+        if self.input_row + 1 < self.rows:
+            self.front[self.input_row + 1] = None
+        if not line:
+            raise EOFError
+        self.notice = ""
+        return line.rstrip("\n")
+
+    def _echo(self, text):
+        if text != "\n":  # the answer stays on the input row until the next render
+            self._send(text)
+
+    # Drawing
+
+    def _grid(self):
+        width = self.columns
+        rule = "─" * width
+        rows = [row[:width] for row in self.status_rows] + [rule]
+        story = self.wrapped[-self.story_rows:] + self._wrap(self.current)
+        visible = story[-self.story_rows:] if self.story_rows > 0 else []
+        rows += [""] * (self.story_rows - len(visible)) + visible
+        rows.append(rule)
+        pane = [self.prompt] + [f"{i}. {label}" for i, label in enumerate(self.options[:CHOICE_ROWS - 4], 1)]
+        pane += [""] * (CHOICE_ROWS - 3 - len(pane)) + [self.notice, self.input_prompt, ""]
+        rows += pane
+        return [row[:width].ljust(width) for row in rows[:self.rows]]
+
+    def render(self):
+        """Send only what changed since the last render"""
+        if self.resized:
+            self._relayout()
+        grid = self._grid()
+        out = []
+        front = self.front
+        cursor = self.cursor
+        top, bottom = self.story_top, self.story_top + self.story_rows - 1
+        position = self._position()
+        shift = min(max(position - self.shown, 0), self.story_rows)
+        self.shown = position
+        if shift and all(front[row] is not None for row in range(top, bottom + 1)):
+            # Line feeds on the region's bottom row make the terminal move the story up;
+            # only the new rows are then redrawn
+            if cursor is None or cursor[0] != bottom:
+                out.append(f"{ESC}{bottom + 1};1H")
+            out.append("\n" * shift + "\r")
+            front[top:bottom + 1] = front[top + shift:bottom + 1] + [" " * self.columns] * shift
+            cursor = (bottom, 0)
+
+        for row, new in enumerate(grid):
+            old = front[row]
+            if old == new:
+                continue
+            if old is None or len(old) != len(new):
+                start, end = 0, len(new)
+            else:
+                start = 0
+                while old[start] == new[start]:
+                    start += 1
+                end = len(new)
+                while old[end - 1] == new[end - 1]:
+                    end -= 1
+            if cursor and cursor[0] == row and cursor[1] < start <= cursor[1] + 8:
+                start = cursor[1]  # resending a few unchanged cells is cheaper than moving the cursor
+            text = new[start:end]
+            rest = new[start:].rstrip(" ")
+            erase = len(rest) < len(text)
+            if erase:
+                text = rest + f"{ESC}K"  # the row is blank from here on: erase instead of sending spaces
+            if cursor != (row, start):  # text typed onto the end of a row needs no cursor move
+                out.append(f"{ESC}{row + 1};{start + 1}H")
+            out.append(text)
+            cursor = (row, start + len(rest) if erase else end)
+            front[row] = new
+
+        self.cursor = cursor
+        if out:
+            self._send("".join(out))
+        self.renders += 1
+
+    def park(self):
+        """Show the cursor at the end of the input prompt, ready for typing"""
+        self.cursor = (self.input_row, len(self.input_prompt))
+        self._send(f"{ESC}{self.input_row + 1};{len(self.input_prompt) + 1}H{ESC}?25h")
+
+    def _send(self, text):
+        data = text.encode("utf-8")
+        self.bytes += len(data)
+        self.out.write(text)
+        self.out.flush()
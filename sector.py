@@ -0,0 +1,228 @@
+"""Procedural Lost Sector maps with a spatial grid and cached A* routes
+
+A Sector scatters star systems over a square at a constant density, keeps
+their coordinates in flat arrays and buckets them in a uniform grid whose
+cells are one jump wide, so "what is within r light years" only looks at
+the few cells the circle touches. Two systems are connected when they are
+within jump range of each other.
+
+Routes use A* with the straight-line distance as heuristic. Every suffix of
+an optimal route is itself optimal, so each system on a found route
+remembers its next hop and remaining distance towards that goal: queries
+from anywhere along it are answered without searching, and new searches
+stop expanding as soon as they touch a cached route.
+
+install() plugs a sector into an Engine: arriving at the signal source
+first drops the captain at the home system, and every system is a
+generated "sector:<id>" scene offering the plotted course or nearby jumps.
+
+    python sector.py --systems 50000 --seed 7
+"""
+import argparse
+import heapq
+import math
+import random
+import time
+from array import array
+
+KINDS = ("empty system", "nebula", "derelict", "asteroid field", "relay beacon")
+LETTERS = "ABCDEFGHJKLMNPQRSTVWXYZ"
+
+
+class Sector:
+    """Star systems with a grid index, jump lanes and a route cache"""
+
+    def __init__(self, systems=20000, seed=None, spacing=10.0, jump=None):
+        rng = random.Random(seed)
+        self.size = math.sqrt(systems) * spacing
+        # ~8 systems within jump range on average keeps the lanes connected
+        self.jump = jump or spacing * math.sqrt(8 / math.pi)
+        self.xs = array("d", (rng.uniform(0, self.size) for _ in range(systems)))
+        self.ys = array("d", (rng.uniform(0, self.size) for _ in range(systems)))
+        self.kinds = array("B", (rng.randrange(len(KINDS)) for _ in range(systems)))
+        self.seed = seed
+        self._index()
+        self.home = self.nearest(0, 0)
+        self.signal = self.nearest(self.size, self.size)
+        while self.route(self.home, self.signal) is None:
+            self.jump *= 1.25  # rare gap in the lanes: widen the jump range
+            self._index()
+
+    def _index(self):
+        self.cell = self.jump
+        self.grid = {}
+        for system in range(len(self.xs)):
+            key = (int(self.xs[system] // self.cell), int(self.ys[system] // self.cell))
+            self.grid.setdefault(key, []).append(system)
+        self.next_hop = {}  # (system, goal) -> next system on the best route
+        self.remaining = {}  # (system, goal) -> length of that best route
+        self.lanes = {}  # system -> neighbours in jump range, filled on demand
+
+    def __len__(self):
+        return len(self.xs)
+
+    def name(self, system):
+        return f"{LETTERS[system % 23]}{LETTERS[system // 23 % 23]}-{system:05d}"
+
+    def kind(self, system):
+        return KINDS[self.kinds[system]]
+
+    def distance(self, a, b):
+        return math.hypot(self.xs[a] - self.xs[b], self.ys[a] - self.ys[b])
+
+    # Spatial queries
+
+    def nearby(self, x, y, radius):
+        """Systems within `radius` of (x, y), nearest first, as (distance, system)"""
+        xs, ys, cell = self.xs, self.ys, self.cell
+        found = []
+        for cx in range(int((x - radius) // cell), int((x + radius) // cell) + 1):
+            for cy in range(int((y - radius) // cell), int((y + radius) // cell) + 1):
+                for system in self.grid.get((cx, cy), ()):
+                    d = math.hypot(xs[system] - x, ys[system] - y)
+                    if d <= radius:
+                        found.append((d, system))
+        found.sort()
+        return found
+
+    def nearest(self, x, y):
+        """Closest system to (x, y), widening the search ring by ring"""
+        radius = self.cell
+        while True:
+            found = self.nearby(x, y, radius)
+            if found:
+                return found[0][1]
+            radius *= 2
+
+    def neighbours(self, system):
+        """Systems one jump away, nearest first"""
+        lanes = self.lanes.get(system)
+        if lanes is None:
+            lanes = self.lanes[system] = [
+                (d, other) for d, other in self.nearby(self.xs[system], self.ys[system], self.jump)
+                if other != system
+            ]
+        return lanes
+
+    # Routing
+
+    def route(self, start, goal):
+        """Shortest list of systems from start to goal, or None when unreachable"""
+        if start != goal and (start, goal) not in self.next_hop and not self._search(start, goal):
+            return None
+        path = [start]
+        while path[-1] != goal:
+            path.append(self.next_hop[path[-1], goal])
+        return path
+
+    def _search(self, start, goal):
+        xs, ys = self.xs, self.ys
+        gx, gy = xs[goal], ys[goal]
+        best = {start: 0.0}
+        parent = {start: None}
+        # (estimate, cost, system, joined): joined entries finish along a cached route
+        frontier = [(math.hypot(xs[start] - gx, ys[start] - gy), 0.0, start, False)]
+        while frontier:
+            estimate, cost, system, joined = heapq.heappop(frontier)
+            if joined or system == goal:
+                self._remember(parent, system, goal)
+                return True
+            if cost > best[system]:
+                continue
+            cached = self.remaining.get((system, goal))
+            if cached is not None:
+                # The rest of the way is already known and optimal; no need to expand
+                heapq.heappush(frontier, (cost + cached, cost + cached, system, True))
+                continue
+            for d, other in self.neighbours(system):
+                new = cost + d
+                if new < best.get(other, math.inf):
+                    best[other] = new
+                    parent[other] = system
+                    heapq.heappush(frontier, (new + math.hypot(xs[other] - gx, ys[other] - gy), new, other, False))
+        return False
+
+    def _remember(self, parent, system, goal):
+        """Record next hops and remaining cost back along the path that reached `system`"""
+        remaining = self.remaining.get((system, goal), 0.0)
+        while parent[system] is not None:
+            previous = parent[system]
+            remaining += self.distance(previous, system)
+            self.next_hop[previous, goal] = system
+            self.remaining[previous, goal] = remaining
+            system = previous
+
+
+def install(engine, sector, destination="signal_source"):
+    """Route every arrival at `destination` through the sector's navigation scenes"""
+
+    def scene_id(system):
+        return destination if system == sector.signal else f"sector:{system}"
+
+    def make(generated_id):
+        system = int(generated_id.partition(":")[2])
+        route = sector.route(system, sector.signal)
+        distance = sector.distance(system, sector.signal)
+        signals = sector.nearby(sector.xs[system], sector.ys[system], sector.jump * 3)
+        derelicts = sum(1 for d, other in signals if sector.kinds[other] == 2)
+        text = [
+            f"\nSystem {sector.name(system)}: {sector.kind(system)}.",
+            f"The signal source lies {distance:.0f} light years away, {len(route) - 1} jumps by the best course.",
+            f"Sensors count {len(signals) - 1} systems nearby, {derelicts} of them derelicts.",
+        ]
+        hop = route[1]
+        choices = [(f"Follow the plotted course to {sector.name(hop)} ({len(route) - 1} jumps left)", scene_id(hop))]
+        for d, other in sector.neighbours(system):
+            if len(choices) == 4:
+                break
+            if other != hop:
+                choices.append((f"Jump to {sector.name(other)}, a {sector.kind(other)} ({d:.0f} ly)", scene_id(other)))
+        return {
+            "text": text,
+            "prompt": "Where do you jump?",
+            "choices": choices,
+            "delay": 1000,
+        }
+
+    engine.provide("sector", make)
+    engine.detour(destination, scene_id(sector.home))
+    return engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a Lost Sector map and time queries on it")
+    parser.add_argument("--systems", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    sector = Sector(args.systems, args.seed)
+    built = time.perf_counter() - start
+    route = sector.route(sector.home, sector.signal)
+    print(f"{len(sector)} systems over {sector.size:.0f} x {sector.size:.0f} ly, "
+          f"jump range {sector.jump:.1f} ly, built in {built * 1000:.0f} ms")
+    print(f"Home {sector.name(sector.home)} -> signal {sector.name(sector.signal)}: {len(route) - 1} jumps")
+
+    rng = random.Random(args.seed)
+    points = [(rng.uniform(0, sector.size), rng.uniform(0, sector.size)) for _ in range(args.queries)]
+    start = time.perf_counter()
+    for x, y in points:
+        sector.nearby(x, y, sector.jump * 3)
+    nearby = (time.perf_counter() - start) / args.queries
+
+    origins = [sector.nearest(x, y) for x, y in points[:100]]
+    start = time.perf_counter()
+    for system in origins:
+        sector.route(system, sector.signal)
+    cold = (time.perf_counter() - start) / len(origins)
+    start = time.perf_counter()
+    for system in origins:
+        sector.route(system, sector.signal)
+    warm = (time.perf_counter() - start) / len(origins)
+
+    print(f"nearby query: {nearby * 1e6:.0f} us | route: {cold * 1000:.2f} ms cold, {warm * 1e6:.0f} us cached")
+
+
+if __name__ == "__main__":
+    main()
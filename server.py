@@ -0,0 +1,328 @@
+"""Multi-session line server for the terminal game
+
+One asyncio process hosts every remote player. Each connection is a
+coroutine driving the shared, read-only Engine with its own compact
+GameState; typewriter pacing and dramatic pauses are asyncio timers, so a
+waiting session costs a suspended coroutine and a socket, not a thread.
+
+Plain TCP and telnet clients both work (telnet negotiation bytes are
+ignored):
+
+    python server.py --port 2347
+    telnet localhost 2347
+    python server.py --bots 1000 --port 2347   # load test a running server
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from engine import Engine
+from state import GameState
+
+IAC, SB, SE = 255, 250, 240
+MAX_LINE = 256
+MAX_FILES = 65536
+OPEN_MAX = 10240  # macOS refuses a soft limit above this
+
+
+def strip_telnet(data):
+    """Drop telnet IAC command and negotiation sequences from raw input"""
+    if IAC not in data:
+        return data
+    out = bytearray()
+    i = 0
+    while i < len(data):
+        byte = data[i]
+        if byte != IAC:
+            out.append(byte)
+            i += 1
+            continue
+        command = data[i + 1] if i + 1 < len(data) else None
+        if command == IAC:  # escaped 255
+            out.append(IAC)
+            i += 2
+        elif command == SB:
+            end = data.find(bytes([IAC, SE]), i + 2)
+            i = len(data) if end < 0 else end + 2
+        elif command is not None and 251 <= command <= 254:  # WILL/WONT/DO/DONT option
+            i += 3
+        else:
+            i += 2
+    return bytes(out)
+
+
+class Session:
+    """One remote player's connection"""
+    __slots__ = ("reader", "writer", "mode", "delay", "fps", "idle", "player")
+
+    def __init__(self, reader, writer, mode="typewriter", delay=0.03, fps=12, idle=600):
+        self.reader = reader
+        self.writer = writer
+        self.mode = mode
+        self.delay = delay
+        self.fps = fps
+        self.idle = idle
+        self.player = None  # current game's GameState
+
+    async def write(self, text):
+        self.writer.write(text.replace("\n", "\r\n").encode("utf-8"))
+        await self.writer.drain()
+
+    async def type(self, text):
+        """Typewriter effect: one write per frame of due characters"""
+        if self.mode == "instant":
+            await self.write(text)
+            return
+        # Like Typewriter._reveal: characters fall due on the clock, so time spent
+        # writing and draining counts against the pacing instead of adding to it
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        frame = 1 / self.fps
+        written = 0
+        total = len(text)
+        while written < total:
+            due = min(total, int((loop.time() - start) / self.delay) + 1)
+            if due > written:
+                await self.write(text[written:due])
+                written = due
+            if written < total:
+                next_due = start + written * self.delay
+                await asyncio.sleep(max(frame, next_due - loop.time()))
+
+    async def slow_print(self, text):
+        await self.type(text + "\n")
+
+    async def pause(self, seconds):
+        if self.mode != "instant":
+            await asyncio.sleep(seconds)
+
+    async def read_line(self, prompt=""):
+        if prompt:
+            await self.write(prompt)
+        try:
+            data = await asyncio.wait_for(self.reader.readline(), self.idle)
+        except ValueError:  # line longer than the stream limit
+            raise ConnectionError("line too long") from None
+        if not data:
+            raise EOFError
+        return strip_telnet(data).decode("utf-8", "replace").strip()
+
+    async def get_choice(self, num_options):
+        while True:
+            answer = await self.read_line("\nYour choice: ")
+            try:
+                choice = int(answer)
+            except ValueError:
+                await self.write("Please enter a valid number\n")
+                continue
+            if 1 <= choice <= num_options:
+                return choice
+            await self.write(f"Please enter a number between 1 and {num_options}\n")
+
+
+def stats_text(player):
+    lines = [
+        f"\n{'='*50}",
+        f"Captain {player.name} | HP: {player.hp}/{player.max_hp} | Energy: {player.energy}",
+    ]
+    if player.inventory:
+        lines.append(f"Inventory: {', '.join(player.inventory)}")
+    if player.crew_members:
+        lines.append(f"Crew: {', '.join(player.crew_members)}")
+    lines.append(f"{'='*50}\n\n")
+    return "\n".join(lines)
+
+
+async def play_scene(session, engine, scene, player):
+    """Drive Engine.steps for one scene, awaiting input and pacing instead of blocking"""
+    steps = engine.steps(scene, player)
+    answer = None
+    try:
+        while True:
+            step = steps.send(answer)
+            answer = None
+            kind = step[0]
+            if kind == "stats":
+                await session.write(stats_text(player))
+            elif kind == "text":
+                await session.slow_print(step[1])
+            elif kind == "choose":
+                menu = "".join(f"{i}. {label}\n" for i, label in enumerate(step[2], 1))
+                await session.write(f"{step[1]}\n{menu}")
+                answer = await session.get_choice(len(step[2]))
+            elif kind == "pause":
+                await session.pause(step[1])
+    except StopIteration as done:
+        return done.value
+
+
+async def play(session, engine, player):
+    """Same scene loop as terminal_game.play, awaiting instead of blocking"""
+    scene = engine.start
+    while True:
+        next_scene = await play_scene(session, engine, scene, player)
+        if next_scene is None:
+            return scene.ending
+        scene = next_scene
+
+
+async def run_session(session, engine):
+    while True:
+        for block in engine.intro():
+            for line in block:
+                await session.slow_print(line)
+            await session.pause(0.5)
+        name = await session.read_line("Enter your captain's name: ")
+        player = session.player = GameState(name[:40] or "Nameless")
+
+        if await play(session, engine, player):
+            await session.slow_print("\n✓ Mission Complete!")
+            await session.slow_print("Thank you for playing Starship Odyssey!")
+            return
+        await session.slow_print("\nWould you like to try again? (y/n)")
+        if (await session.read_line()).lower() != "y":
+            return
+
+
+async def close(writer):
+    """Close a connection and wait until it is gone, so the socket is not left to the GC"""
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except (ConnectionError, OSError):
+        pass  # the peer went away first
+
+
+class Server:
+    """Accepts connections and runs one game coroutine per player"""
+
+    def __init__(self, engine=None, mode="typewriter", max_sessions=10000, idle=600, log=sys.stderr, fps=12):
+        self.engine = engine or Engine()
+        self.mode = mode
+        self.fps = fps
+        self.max_sessions = max_sessions
+        self.idle = idle
+        self.log = log
+        self.active = 0
+        self.served = 0
+
+    async def handle(self, reader, writer):
+        if self.active >= self.max_sessions:
+            writer.write(b"Server full, please try again later.\r\n")
+            await close(writer)
+            return
+        self.active += 1
+        self.served += 1
+        session = Session(reader, writer, self.mode, fps=self.fps, idle=self.idle)
+        try:
+            await run_session(session, self.engine)
+        except (EOFError, ConnectionError, asyncio.TimeoutError):
+            pass
+        finally:
+            self.active -= 1
+            if self.engine.telemetry and session.player is not None:
+                self.engine.telemetry.forget(session.player)
+            await close(writer)
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_LINE, backlog=1024)
+        addresses = ", ".join(str(sock.getsockname()[:2]) for sock in server.sockets)
+        print(f"Starship Odyssey server listening on {addresses}", file=self.log)
+        async with server:
+            await server.serve_forever()
+
+
+async def bot(host, port, rng):
+    """Scripted client: answers every prompt at random until the game ends"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        buffer = b""
+        while True:
+            data = await reader.read(4096)
+            if not data:
+                return True
+            buffer = (buffer + data)[-200:]
+            if buffer.endswith(b"name: "):
+                writer.write(b"Bot\r\n")
+            elif buffer.endswith(b"choice: "):
+                writer.write(f"{rng.randint(1, 3)}\r\n".encode())
+            elif buffer.endswith(b"(y/n)\r\n"):
+                writer.write(b"n\r\n")
+            else:
+                continue
+            buffer = b""
+    except ConnectionError:
+        return False
+    finally:
+        await close(writer)
+
+
+async def load_test(host, port, clients, seed=None):
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(bot(host, port, rng) for _ in range(clients)), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    finished = sum(result is True for result in results)
+    print(f"{finished}/{clients} sessions played to the end in {elapsed:.2f}s")
+
+
+def raise_file_limit():
+    """Allow as many sockets as the hard limit permits, up to MAX_FILES"""
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    # An unlimited hard limit (the macOS default) cannot be used as the soft limit
+    target = MAX_FILES if hard == resource.RLIM_INFINITY else min(hard, MAX_FILES)
+    for limit in (target, min(target, OPEN_MAX)):
+        if soft == resource.RLIM_INFINITY or soft >= limit:
+            return
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (limit, hard))
+            return
+        except (ValueError, OSError):
+            continue  # try a smaller limit, or keep the current one
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host Starship Odyssey for many players over TCP/telnet")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2347)
+    parser.add_argument("--text", choices=["typewriter", "instant"], default="typewriter")
+    parser.add_argument("--fps", type=float, default=12, help="typewriter frames (writes) per second per player")
+    parser.add_argument("--max-sessions", type=int, default=10000)
+    parser.add_argument("--idle", type=float, default=600, help="seconds before an idle player is disconnected")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--language", default="en", help="text pack to serve (see text/)")
+    parser.add_argument("--telemetry", metavar="PATH", help="log every session's choices, combat and endings here")
+    parser.add_argument("--bots", type=int, metavar="N", help="connect N scripted clients to a running server")
+    args = parser.parse_args()
+    if args.fps <= 0:
+        parser.error("--fps must be positive")
+
+    raise_file_limit()
+    try:
+        if args.bots:
+            asyncio.run(load_test(args.host, args.port, args.bots, args.seed))
+        else:
+            engine = Engine(rng=random.Random(args.seed), language=args.language)
+            if args.telemetry:
+                from telemetry import Telemetry
+                engine.telemetry = Telemetry(args.telemetry)
+            try:
+                asyncio.run(Server(engine, args.text, args.max_sessions, args.idle, fps=args.fps).serve(args.host, args.port))
+            finally:
+                if engine.telemetry:
+                    engine.telemetry.close()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
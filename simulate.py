@@ -0,0 +1,265 @@
+"""Headless batch simulator for Starship Odyssey playthroughs
+
+Plays the story from distress_signal to an ending many times without any
+text pacing, spreading the runs across a process pool, and reports ending
+frequencies, HP/energy distributions and path counts.
+
+    python simulate.py -n 1000000 --policy random
+    python simulate.py -n 10000 --policy scripted --script 1,2,1,1,1
+"""
+import argparse
+import json
+import os
+import random
+from collections import Counter
+from multiprocessing import Pool
+
+from bundle import story
+from engine import Engine
+from state import GameState
+
+MAX_STEPS = 1000
+ACTIONS = [action for action, icon in story.COMBAT_ACTIONS]
+
+_engine = None
+
+
+class RandomPolicy:
+    """Pick every option with equal probability"""
+
+    def choose(self, scene, options, rng, turn):
+        return rng.randrange(len(options))
+
+
+class WeightedPolicy:
+    """Pick options with per-scene weights, uniformly where none are given"""
+
+    def __init__(self, weights=None):
+        self.weights = weights or {}
+
+    def choose(self, scene, options, rng, turn):
+        weights = self.weights.get(scene.id)
+        if not weights:
+            return rng.randrange(len(options))
+        return rng.choices(range(len(options)), weights[:len(options)])[0]
+
+
+class ScriptedPolicy:
+    """Replay fixed 1-based answers in order, then keep picking the first option"""
+
+    def __init__(self, answers):
+        self.answers = list(answers)
+
+    def choose(self, scene, options, rng, turn):
+        if turn < len(self.answers):
+            answer = self.answers[turn]
+            if answer > len(options):
+                raise ValueError(f"--script answer {turn + 1} is {answer}, but {scene.id} has {len(options)} options")
+            return answer - 1
+        return 0
+
+
+def playthrough(engine, policy, rng, max_steps=MAX_STEPS):
+    """Play one game headlessly and return (ending ID, player, path)"""
+    player = GameState("Simulator")
+    scene = engine.start
+    path = []
+    turn = 0
+
+    for _ in range(max_steps):
+        path.append(scene.id)
+        engine.apply(scene, player)
+
+        if scene.ending is not None:
+            return scene.id, player, path
+
+        if scene.combat:
+            fight = scene.combat
+            enemy_hp = fight.hp
+            while enemy_hp > 0 and player.hp > 0:
+                action = ACTIONS[policy.choose(scene, ACTIONS, rng, turn)]
+                turn += 1
+                enemy_hp, messages = engine.combat_turn(fight, player, enemy_hp, action, rng)
+            scene = engine.combat_result(fight, player, enemy_hp)
+        elif scene.choices:
+            scene = engine.follow(scene, player, policy.choose(scene, scene.choices, rng, turn) + 1)
+            turn += 1
+        else:
+            scene = engine.follow(scene, player)
+
+    return None, player, path
+
+
+def new_results():
+    return {"runs": 0, "endings": Counter(), "hp": Counter(), "energy": Counter(), "paths": Counter()}
+
+
+def merge_results(total, part):
+    """Add one chunk's results into the running total"""
+    total["runs"] += part["runs"]
+    for key in ("endings", "hp", "energy", "paths"):
+        total[key].update(part[key])
+    return total
+
+
+def _init_worker():
+    global _engine
+    _engine = Engine()
+
+
+def simulate_chunk(args):
+    """Run a chunk of playthroughs with its own seeded RNG"""
+    runs, seed, policy = args
+    engine = _engine or Engine()
+    rng = random.Random(seed)
+    results = new_results()
+    endings, hp, energy, paths = results["endings"], results["hp"], results["energy"], results["paths"]
+
+    for _ in range(runs):
+        ending, player, path = playthrough(engine, policy, rng)
+        endings[ending or "unfinished"] += 1
+        hp[player.hp] += 1
+        energy[player.energy] += 1
+        paths[" > ".join(path)] += 1
+
+    results["runs"] = runs
+    return results
+
+
+def simulate(runs, policy=None, workers=None, seed=None, chunk_size=None):
+    """Run `runs` playthroughs across a process pool and merge the results"""
+    policy = policy or RandomPolicy()
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, min(50000, runs // (workers * 4) or 1))
+    seeder = random.Random(seed)
+
+    chunks = []
+    remaining = runs
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        chunks.append((size, seeder.getrandbits(64), policy))
+        remaining -= size
+
+    total = new_results()
+    if workers == 1:
+        for chunk in chunks:
+            merge_results(total, simulate_chunk(chunk))
+        return total
+
+    with Pool(workers, initializer=_init_worker) as pool:
+        for part in pool.imap_unordered(simulate_chunk, chunks):
+            merge_results(total, part)
+    return total
+
+
+def summarize(results, top_paths=10):
+    """Turn raw counters into a JSON-friendly report"""
+    runs = results["runs"] or 1
+
+    def distribution(counter):
+        count = sum(counter.values()) or 1
+        return {
+            "mean": sum(value * n for value, n in counter.items()) / count,
+            "min": min(counter, default=0),
+            "max": max(counter, default=0),
+            "histogram": {str(value): n for value, n in sorted(counter.items())},
+        }
+
+    return {
+        "runs": results["runs"],
+        "endings": {
+            ending: {"count": n, "share": n / runs}
+            for ending, n in results["endings"].most_common()
+        },
+        "hp": distribution(results["hp"]),
+        "energy": distribution(results["energy"]),
+        "distinct_paths": len(results["paths"]),
+        "top_paths": [
+            {"path": path, "count": n} for path, n in results["paths"].most_common(top_paths)
+        ],
+    }
+
+
+def print_report(report):
+    print(f"\n{'='*50}")
+    print(f"Playthroughs: {report['runs']}")
+    print(f"{'='*50}")
+    for ending, stats in report["endings"].items():
+        print(f"{ending:<20} {stats['count']:>10} {stats['share']:>8.2%}")
+    for key in ("hp", "energy"):
+        dist = report[key]
+        print(f"\n{key.upper()}: mean {dist['mean']:.1f} | min {dist['min']} | max {dist['max']}")
+    print(f"\nDistinct paths: {report['distinct_paths']}")
+    for entry in report["top_paths"]:
+        print(f"{entry['count']:>10}  {entry['path']}")
+
+
+def parse_weights(specs, engine):
+    """Parse 'scene=w1,w2,w3' weight specs, one weight per option of the scene"""
+    weights = {}
+    for spec in specs:
+        scene_id, _, values = spec.partition("=")
+        try:
+            scene = engine.scene(scene_id)
+        except ValueError:
+            raise ValueError(f"--weight {spec}: no scene named {scene_id!r}") from None
+        options = len(ACTIONS) if scene.combat else len(scene.choices)
+        try:
+            values = [float(value) for value in values.split(",")]
+        except ValueError:
+            raise ValueError(f"--weight {spec}: weights must be numbers") from None
+        if len(values) != options:
+            raise ValueError(f"--weight {spec}: {scene_id} has {options} options, got {len(values)} weights")
+        if min(values) < 0 or not sum(values) > 0:
+            raise ValueError(f"--weight {spec}: weights must be non-negative and not all zero")
+        weights[scene_id] = values
+    return weights
+
+
+def parse_script(spec):
+    """Parse comma-separated 1-based answers"""
+    try:
+        answers = [int(answer) for answer in spec.split(",") if answer]
+    except ValueError:
+        raise ValueError(f"--script {spec}: answers must be whole numbers") from None
+    if any(answer < 1 for answer in answers):
+        raise ValueError(f"--script {spec}: answers start at 1")
+    return answers
+
+
+def make_policy(args):
+    if args.policy == "weighted":
+        return WeightedPolicy(parse_weights(args.weight, Engine()))
+    if args.policy == "scripted":
+        return ScriptedPolicy(parse_script(args.script))
+    return RandomPolicy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate Starship Odyssey playthroughs headlessly")
+    parser.add_argument("-n", "--runs", type=int, default=100000, help="number of playthroughs")
+    parser.add_argument("--policy", choices=["random", "weighted", "scripted"], default="random")
+    parser.add_argument("--weight", action="append", default=[], metavar="SCENE=W1,W2,...",
+                        help="choice weights for one scene (weighted policy)")
+    parser.add_argument("--script", default="", help="comma-separated answers (scripted policy)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", metavar="PATH", help="write the report as JSON")
+    args = parser.parse_args()
+
+    try:
+        policy = make_policy(args)
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        report = summarize(simulate(args.runs, policy, args.workers, args.seed))
+    except ValueError as e:  # a script that does not fit the story
+        parser.error(str(e))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Compact, hashable game state
+
+GameState is a __slots__ stand-in for Player that interns item and crew
+names into small integer IDs and keeps a bitset of what the captain holds,
+so membership checks like "Crystalline Key" in state.inventory are a single
+bit test. It drops into the engine wherever a Player is expected.
+
+snapshot() returns an immutable, hashable Snapshot tuple that converts back
+losslessly (order and duplicates included); key() returns an
+order-insensitive tuple for deduplicating states in solvers and simulators.
+"""
+from collections import namedtuple
+
+from bundle import story
+from engine import Player
+
+
+class Interner:
+    """Maps names to dense integer IDs and back"""
+
+    def __init__(self, names=()):
+        self.names = []
+        self.ids = {}
+        for name in names:
+            self.intern(name)
+
+    def intern(self, name):
+        index = self.ids.get(name)
+        if index is None:
+            index = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def name(self, index):
+        return self.names[index]
+
+
+def _story_names():
+    """Item and crew names mentioned anywhere in the story, in story order"""
+    items, crew = [], []
+    for data in story.SCENES.values():
+        for kind, value in data.get("effects", ()):
+            if kind == "item":
+                items.append(value)
+            elif kind == "crew":
+                crew.append(value)
+        branches = data.get("next")
+        for condition, target in (branches if isinstance(branches, list) else ()):
+            if condition and condition[0] in ("has_any", "has_all"):
+                items.extend(condition[1:])
+            elif condition and condition[0] == "has_crew":
+                crew.append(condition[1])
+    return items, crew
+
+
+_items, _crew = _story_names()
+ITEMS = Interner(_items)
+CREW = Interner(_crew)
+
+Snapshot = namedtuple("Snapshot", "scene name hp max_hp energy items crew")
+
+
+class _Names:
+    """List-like view of the interned names a GameState holds"""
+    __slots__ = ("state", "crew")
+
+    def __init__(self, state, crew):
+        self.state = state
+        self.crew = crew
+
+    def _parts(self):
+        if self.crew:
+            return CREW, self.state.crew, self.state.crew_bits
+        return ITEMS, self.state.items, self.state.item_bits
+
+    def __contains__(self, name):
+        table, ids, bits = self._parts()
+        index = table.ids.get(name)
+        return index is not None and bool(bits >> index & 1)
+
+    def __iter__(self):
+        table, ids, bits = self._parts()
+        return (table.name(index) for index in ids)
+
+    def __len__(self):
+        return len(self._parts()[1])
+
+    def __bool__(self):
+        return bool(self._parts()[1])
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def append(self, name):
+        if self.crew:
+            self.state.add_crew(name)
+        else:
+            self.state.add_item(name)
+
+
+class GameState:
+    __slots__ = (
+        "scene", "name", "hp", "max_hp", "energy", "items", "crew", "item_bits", "crew_bits",
+        "inventory", "crew_members",
+    )
+
+    def __init__(self, name, scene=None):
+        self.scene = scene
+        self.name = name
+        self.hp = 100
+        self.max_hp = 100
+        self.energy = 50
+        self.items = ()  # interned item IDs in the order they were picked up
+        self.crew = ()
+        self.item_bits = 0
+        self.crew_bits = 0
+        # Player interface, so the engine can run on a GameState directly
+        self.inventory = _Names(self, False)
+        self.crew_members = _Names(self, True)
+
+    def take_damage(self, damage):
+        self.hp -= damage
+        if self.hp < 0:
+            self.hp = 0
+
+    def heal(self, amount):
+        self.hp += amount
+        if self.hp > self.max_hp:
+            self.hp = self.max_hp
+
+    def add_item(self, name):
+        index = ITEMS.intern(name)
+        self.items += (index,)
+        self.item_bits |= 1 << index
+
+    def add_crew(self, name):
+        index = CREW.intern(name)
+        self.crew += (index,)
+        self.crew_bits |= 1 << index
+
+    def has_item(self, name):
+        index = ITEMS.ids.get(name)
+        return index is not None and bool(self.item_bits >> index & 1)
+
+    # Conversions
+
+    def snapshot(self):
+        """Immutable, hashable copy that restores losslessly"""
+        return Snapshot(self.scene, self.name, self.hp, self.max_hp, self.energy, self.items, self.crew)
+
+    def key(self):
+        """Order-insensitive identity for deduplication (ignores the captain's name)"""
+        return (self.scene, self.hp, self.max_hp, self.energy, self.item_bits, self.crew_bits)
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        state = cls(snapshot.name, snapshot.scene)
+        state.hp = snapshot.hp
+        state.max_hp = snapshot.max_hp
+        state.energy = snapshot.energy
+        state.items = snapshot.items
+        state.crew = snapshot.crew
+        for index in state.items:
+            state.item_bits |= 1 << index
+        for index in state.crew:
+            state.crew_bits |= 1 << index
+        return state
+
+    @classmethod
+    def from_player(cls, player, scene=None):
+        state = cls(player.name, scene)
+        state.hp = player.hp
+        state.max_hp = player.max_hp
+        state.energy = player.energy
+        for item in player.inventory:
+            state.add_item(item)
+        for member in player.crew_members:
+            state.add_crew(member)
+        return state
+
+    def to_player(self):
+        player = Player(self.name)
+        player.hp = self.hp
+        player.max_hp = self.max_hp
+        player.energy = self.energy
+        player.inventory = list(self.inventory)
+        player.crew_members = list(self.crew_members)
+        return player
+
+    def copy(self):
+        return GameState.from_snapshot(self.snapshot())
+
+    def __eq__(self, other):
+        return isinstance(other, GameState) and self.snapshot() == other.snapshot()
+
+    __hash__ = None  # mutable; hash snapshot() or key() instead
+
+    def __repr__(self):
+        return f"GameState({self.snapshot()!r})"
@@ -0,0 +1,172 @@
+"""Story structure for Starship Odyssey: The Lost Sector
+
+Every scene is a plain data entry keyed by its scene ID. The engine compiles
+this table once and both the terminal and GUI frontends drive it. The words
+the player reads live in per-language text files (text/en.json) that
+textpack.py compiles into memory-mapped packs.
+
+Scene keys:
+    stats    - show the stats banner before the scene (terminal)
+    effects  - changes applied to the player after the narration
+    choices  - target scenes, in the order the text file lists their labels
+    next     - target scene, or a list of (condition, target) pairs where the
+               first matching condition wins and None always matches
+    delay    - GUI pause in milliseconds before choices or the next scene
+    combat   - encounter settings for combat scenes
+    ending   - True for a successful ending, False for game over
+
+Scenes that are not in the text pack (generated or test content) can carry
+their words inline: "text" lines, a "prompt" and (label, target) choices.
+"""
+
+START = "distress_signal"
+
+COMBAT_ACTIONS = [
+    ("attack", "⚔️"),
+    ("defend", "🛡️"),
+    ("heal", "💊"),
+]
+
+SCENES = {
+    "distress_signal": {
+        "stats": True,
+        "choices": ["investigate_ship", "probe_scan", "ignore_ship"],
+    },
+    "investigate_ship": {
+        "choices": ["call_out", "combat_droid", "check_computer"],
+        "delay": 2000,
+    },
+    "call_out": {
+        "effects": [("crew", "Dr. Chen"), ("energy", 10)],
+        "next": "ancient_artifact",
+        "delay": 3000,
+    },
+    "check_computer": {
+        "effects": [("item", "Ancient Map")],
+        "next": "ancient_artifact",
+        "delay": 3000,
+    },
+    "combat_droid": {
+        "combat": {
+            "enemy": "Droid",
+            "hp": 50,
+            "attack": (20, 30),
+            "strike": (15, 25),
+            "defend": (5, 10),
+            "heal": 25,
+            "win": "droid_defeated",
+            "lose": "game_over",
+        },
+        "delay": 2000,
+    },
+    "droid_defeated": {
+        "effects": [("item", "Power Cell")],
+        "next": "ancient_artifact",
+        "delay": 3000,
+    },
+    "probe_scan": {
+        "effects": [("energy", -5)],
+        "choices": ["investigate_ship", "call_backup", "signal_source"],
+        "delay": 2000,
+    },
+    "call_backup": {
+        "next": "backup_ending",
+        "delay": 3000,
+    },
+    "ignore_ship": {
+        "effects": [("hp", -20)],
+        "next": "alien_vessel",
+        "delay": 2000,
+    },
+    "alien_vessel": {
+        "next": "alien_encounter",
+        "delay": 2000,
+    },
+    "ancient_artifact": {
+        "stats": True,
+        "choices": ["take_artifact", "report_findings", "study_artifact"],
+        "delay": 2000,
+    },
+    "take_artifact": {
+        "effects": [("item", "Crystalline Artifact")],
+        "next": "gateway_choice",
+        "delay": 3000,
+    },
+    "report_findings": {
+        "next": "safe_ending",
+        "delay": 3000,
+    },
+    "study_artifact": {
+        "effects": [("item", "Crystalline Key")],
+        "next": "signal_source",
+        "delay": 3000,
+    },
+    "alien_encounter": {
+        "stats": True,
+        "choices": ["peaceful_alien", "aggressive_alien", "curious_alien"],
+        "delay": 2000,
+    },
+    "peaceful_alien": {
+        "effects": [("crew", "Keeper Guide")],
+        "next": "gateway_choice",
+        "delay": 3000,
+    },
+    "aggressive_alien": {
+        "effects": [("hp", -30)],
+        "next": "alien_encounter",
+        "delay": 3000,
+    },
+    "curious_alien": {
+        "next": "gateway_choice",
+        "delay": 3000,
+    },
+    "signal_source": {
+        "stats": True,
+        "next": [
+            (("has_any", "Crystalline Key", "Crystalline Artifact"), "station_unlocked"),
+            (None, "station_sealed"),
+        ],
+    },
+    "station_unlocked": {
+        "next": "gateway_choice",
+        "delay": 3000,
+    },
+    "station_sealed": {
+        "next": "search_ending",
+        "delay": 3000,
+    },
+    "gateway_choice": {
+        "stats": True,
+        "choices": ["explorer_ending", "scientist_ending", "diplomat_ending"],
+        "delay": 2000,
+    },
+    # ENDINGS
+    "explorer_ending": {
+        "stats": True,
+        "ending": True,
+    },
+    "scientist_ending": {
+        "stats": True,
+        "ending": True,
+    },
+    "diplomat_ending": {
+        "stats": True,
+        "ending": True,
+    },
+    "safe_ending": {
+        "stats": True,
+        "ending": True,
+    },
+    "backup_ending": {
+        "stats": True,
+        "ending": True,
+    },
+    "search_ending": {
+        "stats": True,
+        "ending": True,
+    },
+    "game_over": {
+        "stats": True,
+        "ending": False,
+    },
+}
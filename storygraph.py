@@ -0,0 +1,381 @@
+"""Static analysis and reachability index for the story graph
+
+Extracts every edge of the compiled scene graph (choices, next branches and
+combat outcomes) with the inventory conditions that guard it, then explores
+the graph over abstract states: the scene plus which condition-relevant
+items and crew the captain holds. HP and energy never gate a transition, and
+either side of a fight can win, so this abstraction is exact.
+
+The result is a ReachabilityIndex with a table of reachable endings for
+every (scene, relevant inventory) pair, so runtime questions like "can this
+ending still be reached" are a dict lookup. Engine.index() builds it once.
+
+    python storygraph.py            # report, exit 1 on dead content
+    python storygraph.py --json graph.json
+"""
+import argparse
+import json
+import sys
+from collections import deque
+
+from engine import Engine, check
+from state import GameState
+
+
+class Edge:
+    __slots__ = ("source", "target", "kind", "label", "condition", "unless")
+
+    def __init__(self, source, target, kind, label=None, condition=None, unless=()):
+        self.source = source
+        self.target = target
+        self.kind = kind  # "choice", "next", "win" or "lose"
+        self.label = label
+        self.condition = condition
+        self.unless = unless  # earlier branch conditions that must all fail
+
+    def prerequisites(self):
+        """Readable inventory prerequisites, empty when the edge is always open"""
+        needs = []
+        if self.condition is not None:
+            needs.append(describe(self.condition))
+        needs.extend(f"not {describe(condition)}" for condition in self.unless)
+        return needs
+
+
+def describe(condition):
+    kind = condition[0]
+    if kind == "has_any":
+        return "any of " + ", ".join(condition[1:])
+    if kind == "has_all":
+        return "all of " + ", ".join(condition[1:])
+    if kind == "has_crew":
+        return f"crew {condition[1]}"
+    return repr(condition)
+
+
+def edges_of(scene):
+    """Outgoing edges of one compiled scene, in the order the engine tries them"""
+    edges = [Edge(scene, choice.target, "choice", choice.label) for choice in scene.choices]
+    earlier = []
+    for condition, target in scene.next:
+        edges.append(Edge(scene, target, "next", condition=condition, unless=tuple(earlier)))
+        if condition is None:
+            break
+        earlier.append(condition)
+    if scene.combat:
+        edges.append(Edge(scene, scene.combat.win, "win"))
+        edges.append(Edge(scene, scene.combat.lose, "lose"))
+    return edges
+
+
+def _conditions(engine):
+    for scene in engine.scenes:
+        for condition, target in scene.next:
+            if condition is not None:
+                yield condition
+
+
+class ReachabilityIndex:
+    """Precomputed endings reachable from every scene and relevant inventory"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        written = {scene.id for scene in engine.scenes}
+        self.edges = {scene.id: self._story_edges(scene, written) for scene in engine.scenes}
+
+        items, crew = set(), set()
+        for condition in _conditions(engine):
+            if condition[0] == "has_crew":
+                crew.add(condition[1])
+            else:
+                items.update(condition[1:])
+        # Only names some condition looks at can change where the story goes
+        self.items = sorted(items)
+        self.crew = sorted(crew)
+        self.names = [("item", name) for name in self.items] + [("crew", name) for name in self.crew]
+        self.endings = [scene.id for scene in engine.scenes if scene.ending is not None]
+
+        self._gains = {scene.id: self._bits_of_effects(scene) for scene in engine.scenes}
+        self.table = {}
+        self._build()
+
+    def _story_edges(self, scene, written):
+        """edges_of(scene) with generated scenes (Engine.provide) kept out of the graph
+
+        A link detoured into a generated scene is followed to the story scene it
+        stands in for; links into other generated scenes are left out.
+        """
+        edges = []
+        for edge in edges_of(scene):
+            if edge.target.id not in written:
+                original = self.engine.detours.get(edge.target.id)
+                if original is None:
+                    continue
+                edge.target = self.engine.ids[original]
+            edges.append(edge)
+        return edges
+
+    # Abstract state: (scene ID, bitmask over self.names)
+
+    def _bits_of_effects(self, scene):
+        bits = 0
+        for kind, value in scene.effects:
+            if (kind, value) in self.names:
+                bits |= 1 << self.names.index((kind, value))
+        return bits
+
+    def bits(self, player):
+        """Bitmask of the relevant items and crew a Player or GameState holds"""
+        bits = 0
+        for index, (kind, name) in enumerate(self.names):
+            held = player.inventory if kind == "item" else player.crew_members
+            if name in held:
+                bits |= 1 << index
+        return bits
+
+    def _player(self, bits):
+        state = GameState("Index")
+        for index, (kind, name) in enumerate(self.names):
+            if bits >> index & 1:
+                (state.add_item if kind == "item" else state.add_crew)(name)
+        return state
+
+    def open_edges(self, scene_id, bits):
+        """Edges that can fire from a scene once its effects are applied"""
+        bits |= self._gains[scene_id]
+        player = self._player(bits)
+        return [
+            edge for edge in self.edges[scene_id]
+            if (edge.condition is None or check(edge.condition, player))
+            and not any(check(condition, player) for condition in edge.unless)
+        ]
+
+    def successors(self, scene_id, bits):
+        bits |= self._gains[scene_id]
+        return [(edge, (edge.target.id, bits)) for edge in self.open_edges(scene_id, bits)]
+
+    def _build(self):
+        """Fill self.table for every scene and inventory by backward propagation"""
+        nodes = [(scene.id, bits) for scene in self.engine.scenes for bits in range(1 << len(self.names))]
+        predecessors = {node: [] for node in nodes}
+        reach = {}
+        work = deque()
+        for node in nodes:
+            scene = self.engine.ids[node[0]]
+            reach[node] = {scene.id} if scene.ending is not None else set()
+            for edge, target in self.successors(*node):
+                predecessors[target].append(node)
+            if reach[node]:
+                work.append(node)
+
+        while work:
+            node = work.popleft()
+            for source in predecessors[node]:
+                if not reach[node] <= reach[source]:
+                    reach[source] |= reach[node]
+                    work.append(source)
+
+        self.table = {node: frozenset(endings) for node, endings in reach.items()}
+
+    # Runtime queries
+
+    def _story_id(self, scene):
+        """ID of the indexed story scene for a scene or ID; detours count as their story scene"""
+        scene_id = scene if isinstance(scene, str) else scene.id
+        return self.engine.detours.get(scene_id, scene_id)
+
+    def key(self, scene, player):
+        scene_id = self._story_id(scene)
+        if scene_id not in self._gains:
+            raise ValueError(f"Scene {scene_id!r} is not in the reachability index (generated scenes are not indexed)")
+        return scene_id, self.bits(player) | self._gains[scene_id]
+
+    def reachable_endings(self, scene, player):
+        """Endings still reachable from `scene` with the player's inventory"""
+        return self.table[self.key(scene, player)]
+
+    def can_reach(self, scene, player, ending):
+        return ending in self.table[self.key(scene, player)]
+
+    def choices_toward(self, scene, player, ending):
+        """1-based choices that keep `ending` reachable, for hints"""
+        scene_id, bits = self.key(scene, player)
+        return [
+            number for number, choice in enumerate(self.engine.ids[scene_id].choices, 1)
+            if ending in self.table.get((self._story_id(choice.target), bits), ())
+        ]
+
+    # Build-time analysis
+
+    def explore(self, start=None):
+        """Abstract states reachable from the start, with a BFS parent for routes"""
+        start = (start or self.engine.start.id, 0)
+        parents = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for edge, target in self.successors(*node):
+                if target not in parents:
+                    parents[target] = node
+                    queue.append(target)
+        return parents
+
+    def cycles(self):
+        """Strongly connected groups of scenes (Tarjan), ignoring conditions"""
+        graph = {scene_id: [edge.target.id for edge in edges] for scene_id, edges in self.edges.items()}
+        index, low, stack, on_stack, groups = {}, {}, [], set(), []
+
+        for root in graph:
+            if root in index:
+                continue
+            work = [(root, iter(graph[root]))]
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, children = work[-1]
+                child = next(children, None)
+                if child is None:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        group = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            group.append(member)
+                            if member == node:
+                                break
+                        if len(group) > 1 or node in graph[node]:
+                            groups.append(sorted(group, key=lambda scene_id: self.engine.ids[scene_id].index))
+                elif child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(graph[child])))
+                elif child in on_stack:
+                    low[node] = min(low[node], index[child])
+        return groups
+
+    def analyze(self):
+        """Full report as a JSON-friendly dict; `errors` lists dead content"""
+        parents = self.explore()
+        reached = {scene_id for scene_id, bits in parents}
+
+        def route(node):
+            path = []
+            while node is not None:
+                path.append(node[0])
+                node = parents[node]
+            return path[::-1]
+
+        endings = {}
+        for ending in self.endings:
+            nodes = [node for node in parents if node[0] == ending]
+            endings[ending] = {
+                "reachable": bool(nodes),
+                "success": self.engine.ids[ending].ending,
+                "shortest_route": route(min(nodes, key=lambda node: len(route(node)))) if nodes else None,
+            }
+
+        taken = set()
+        for node in parents:
+            for edge in self.open_edges(*node):
+                taken.add(id(edge))
+
+        granted = {(kind, value) for scene in self.engine.scenes for kind, value in scene.effects
+                   if kind in ("item", "crew")}
+        errors = []
+        errors += [f"scene {scene.id!r} is unreachable" for scene in self.engine.scenes if scene.id not in reached]
+        errors += [f"ending {ending!r} is unreachable" for ending, info in endings.items() if not info["reachable"]]
+        errors += [
+            f"{edge.kind} edge {edge.source.id} -> {edge.target.id} can never be taken"
+            for edges in self.edges.values() for edge in edges
+            if edge.source.id in reached and id(edge) not in taken
+        ]
+        errors += [
+            f"no ending reachable from {scene_id!r} with {self._describe_bits(bits)}"
+            for scene_id, bits in parents if not self.table[scene_id, bits]
+        ]
+        errors += [f"{kind} {name!r} is checked but never granted"
+                   for kind, name in self.names if (kind, name) not in granted]
+
+        warnings = [f"{kind} {name!r} is granted but never checked"
+                    for kind, name in sorted(granted) if (kind, name) not in self.names]
+
+        cycles = []
+        for group in self.cycles():
+            exits = sorted({edge.target.id for scene_id in group for edge in self.edges[scene_id]
+                            if edge.target.id not in group})
+            cycles.append({"scenes": group, "exits": exits})
+            if not exits:
+                errors.append(f"cycle {' -> '.join(group)} has no way out")
+
+        return {
+            "scenes": len(self.engine.scenes),
+            "states": len(parents),
+            "endings": endings,
+            "edges": [
+                {
+                    "source": edge.source.id,
+                    "target": edge.target.id,
+                    "kind": edge.kind,
+                    "label": edge.label,
+                    "requires": edge.prerequisites(),
+                }
+                for edges in self.edges.values() for edge in edges
+            ],
+            "cycles": cycles,
+            "errors": errors,
+            "warnings": warnings,
+        }
+
+    def _describe_bits(self, bits):
+        held = [name for index, (kind, name) in enumerate(self.names) if bits >> index & 1]
+        return ", ".join(held) if held else "nothing relevant"
+
+
+def print_report(report):
+    print(f"\n{'='*50}")
+    print(f"Scenes: {report['scenes']} | abstract states reached: {report['states']}")
+    print(f"{'='*50}")
+    for ending, info in report["endings"].items():
+        status = "reachable" if info["reachable"] else "UNREACHABLE"
+        print(f"{ending:<20} {status}")
+        if info["shortest_route"]:
+            print(f"    {' > '.join(info['shortest_route'])}")
+    gated = [edge for edge in report["edges"] if edge["requires"]]
+    if gated:
+        print("\nGated edges:")
+        for edge in gated:
+            print(f"    {edge['source']} -> {edge['target']}: {'; '.join(edge['requires'])}")
+    if report["cycles"]:
+        print("\nCycles:")
+        for cycle in report["cycles"]:
+            print(f"    {' <-> '.join(cycle['scenes'])} (exits: {', '.join(cycle['exits']) or 'none'})")
+    for warning in report["warnings"]:
+        print(f"warning: {warning}")
+    for error in report["errors"]:
+        print(f"error: {error}")
+    print(f"\n{len(report['errors'])} error(s), {len(report['warnings'])} warning(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the Starship Odyssey story graph for dead content")
+    parser.add_argument("--json", metavar="PATH", help="write the report as JSON")
+    parser.add_argument("--strict", action="store_true", help="treat warnings as errors")
+    args = parser.parse_args()
+
+    report = Engine().index().analyze()
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if report["errors"] or (args.strict and report["warnings"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
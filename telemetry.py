@@ -0,0 +1,298 @@
+"""Streaming gameplay telemetry: a non-blocking event log and an incremental aggregator
+
+With engine.telemetry set to a Telemetry, the engine records every choice
+taken, every combat round (damage dealt and taken, summed over the fleet in
+fleet battles) and every ending reached.
+emit() only puts a tuple on a queue; a background thread encodes events as
+compact JSON lines, writes them in batches and rotates the log by size:
+
+    telemetry.log  ->  telemetry.log.1  ->  ...  ->  telemetry.log.<backups>
+
+Each event carries the time, a game ID ("<process>-<n>") and its fields:
+
+    {"t":1700000000.12,"g":"1f3a-7","e":"choice","scene":"distress_signal","n":2}
+
+Aggregator keeps running counts and histograms together with how far it has
+read into the log (file identity and offset). Each update() reads only the
+lines appended since, following rotations, and its state can be saved so
+the next run carries on where this one stopped.
+
+    python terminal_game.py --telemetry telemetry.log
+    python telemetry.py telemetry.log            # update and print the totals
+    python telemetry.py telemetry.log --follow   # keep them live
+"""
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import Counter
+
+MAX_BYTES = 1 << 20
+BACKUPS = 5
+BATCH = 512
+MAX_OPEN_GAMES = 100000
+BUCKET = 5  # damage histogram bucket width
+
+
+class Telemetry:
+    """Event sink whose emit() never waits on disk"""
+
+    def __init__(self, path, max_bytes=MAX_BYTES, backups=BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.queue = queue.SimpleQueue()
+        self.prefix = f"{os.getpid():x}"
+        self.games = {}  # id(player) -> (player, game number), for games still in progress
+        self.count = 0
+        self.dropped = 0  # events lost to write errors
+        self.thread = threading.Thread(target=self._writer, name="telemetry", daemon=True)
+        self.thread.start()
+
+    def game(self, player):
+        """Game ID for a player, starting a new game the first time it is seen"""
+        key = id(player)
+        # The entry holds the player itself, so its id cannot be reused by a new player meanwhile
+        entry = self.games.get(key)
+        if entry is None:
+            if len(self.games) >= MAX_OPEN_GAMES:
+                del self.games[next(iter(self.games))]  # abandoned long ago
+            self.count += 1
+            entry = self.games[key] = (player, self.count)
+            self.queue.put((time.time(), f"{self.prefix}-{self.count}", "start", {"name": player.name}))
+        return f"{self.prefix}-{entry[1]}"
+
+    def emit(self, kind, player, **fields):
+        self.queue.put((time.time(), self.game(player), kind, fields))
+
+    def end(self, player, scene):
+        self.emit("ending", player, scene=scene.id, success=bool(scene.ending), hp=player.hp)
+        self.games.pop(id(player), None)
+
+    def forget(self, player):
+        """Stop tracking a game left without an ending, e.g. a dropped connection"""
+        entry = self.games.get(id(player))
+        if entry is not None and entry[0] is player:
+            del self.games[id(player)]
+
+    # Background writer
+
+    def _writer(self):
+        out = None
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < BATCH:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            closing = None in batch  # close() was called
+            batch = [event for event in batch if event is not None]
+            if batch:
+                try:
+                    out = out or open(self.path, "a", encoding="utf-8")
+                    out.write("".join(_encode(event) for event in batch))
+                    out.flush()
+                    if out.tell() >= self.max_bytes:
+                        out.close()
+                        out = None
+                        self._rotate()
+                except OSError:
+                    self.dropped += len(batch)
+                    out = None
+            if closing:
+                if out:
+                    out.close()
+                return
+
+    def _rotate(self):
+        for n in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{n}"):
+                os.replace(f"{self.path}.{n}", f"{self.path}.{n + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def close(self):
+        """Write everything queued so far and stop the writer"""
+        self.queue.put(None)
+        self.thread.join()
+
+
+def _encode(event):
+    t, game, kind, fields = event
+    record = {"t": round(t, 3), "g": game, "e": kind}
+    record.update(fields)
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+
+class Aggregator:
+    """Running totals over a telemetry log, updated from where the last read stopped"""
+
+    def __init__(self, path, backups=BACKUPS):
+        self.path = path
+        self.backups = backups
+        self.position = None  # (device, inode, offset) of the last complete line read
+        self.events = 0
+        self.games = 0
+        self.endings = Counter()
+        self.choices = Counter()  # "scene:n"
+        self.actions = Counter()
+        self.dealt = Counter()  # damage bucket -> rounds
+        self.taken = Counter()
+        self.final_hp = Counter()
+
+    def add(self, record):
+        """Fold one event into the totals"""
+        self.events += 1
+        kind = record.get("e")
+        if kind == "start":
+            self.games += 1
+        elif kind == "choice":
+            self.choices[f"{record['scene']}:{record['n']}"] += 1
+        elif kind == "combat":
+            self.actions[record["action"]] += 1
+            self.dealt[record["dealt"] // BUCKET * BUCKET] += 1
+            self.taken[record["taken"] // BUCKET * BUCKET] += 1
+        elif kind == "ending":
+            self.endings[record["scene"]] += 1
+            self.final_hp[record["hp"] // BUCKET * BUCKET] += 1
+
+    def _files(self):
+        """Log files oldest first, as (path, device, inode)"""
+        files = []
+        for path in [f"{self.path}.{n}" for n in range(self.backups, 0, -1)] + [self.path]:
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            files.append((path, info.st_dev, info.st_ino))
+        return files
+
+    def update(self):
+        """Read lines appended since the last update; returns how many events were added"""
+        files = self._files()
+        start, offset = 0, 0
+        if self.position is not None:
+            device, inode, offset = self.position
+            known = [i for i, (path, dev, ino) in enumerate(files) if (dev, ino) == (device, inode)]
+            if known:
+                start = known[0]
+            else:
+                offset = 0  # rotated out of the backups: everything left on disk is newer
+        added = 0
+        for path, device, inode in files[start:]:
+            try:
+                with open(path, "rb") as f:
+                    f.seek(offset)
+                    data = f.read()
+            except OSError:
+                continue
+            end = data.rfind(b"\n") + 1  # leave a line still being written for next time
+            for line in data[:end].splitlines():
+                try:
+                    self.add(json.loads(line))
+                except (ValueError, KeyError, TypeError):
+                    continue
+                added += 1
+            self.position = (device, inode, offset + end)
+            offset = 0
+        return added
+
+    # Persistence
+
+    def save(self, path):
+        state = {name: getattr(self, name) for name in ("position", "events", "games")}
+        for name in ("endings", "choices", "actions", "dealt", "taken", "final_hp"):
+            state[name] = {str(key): n for key, n in getattr(self, name).items()}
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, log_path, path, backups=BACKUPS):
+        """Aggregator for log_path resumed from a saved state, or a fresh one"""
+        aggregator = cls(log_path, backups)
+        try:
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return aggregator
+        aggregator.position = tuple(state["position"]) if state.get("position") else None
+        aggregator.events = state.get("events", 0)
+        aggregator.games = state.get("games", 0)
+        for name in ("endings", "choices", "actions"):
+            getattr(aggregator, name).update(state.get(name, {}))
+        for name in ("dealt", "taken", "final_hp"):
+            getattr(aggregator, name).update({int(key): n for key, n in state.get(name, {}).items()})
+        return aggregator
+
+    def report(self):
+        finished = sum(self.endings.values())
+        return {
+            "events": self.events,
+            "games": self.games,
+            "finished": finished,
+            "endings": dict(self.endings.most_common()),
+            "choices": dict(sorted(self.choices.items())),
+            "actions": dict(self.actions.most_common()),
+            "damage_dealt": {str(key): n for key, n in sorted(self.dealt.items())},
+            "damage_taken": {str(key): n for key, n in sorted(self.taken.items())},
+            "final_hp": {str(key): n for key, n in sorted(self.final_hp.items())},
+        }
+
+
+def print_report(report):
+    print(f"\n{'='*50}")
+    print(f"Games: {report['games']} started, {report['finished']} finished ({report['events']} events)")
+    print(f"{'='*50}")
+    finished = report["finished"] or 1
+    for ending, n in report["endings"].items():
+        print(f"{ending:<20} {n:>10} {n / finished:>8.2%}")
+    print("\nChoices:")
+    for choice, n in report["choices"].items():
+        print(f"  {choice:<30} {n:>8}")
+    if report["actions"]:
+        print("\nCombat actions: " + ", ".join(f"{action} {n}" for action, n in report["actions"].items()))
+    for key, title in (("damage_dealt", "Damage dealt"), ("damage_taken", "Damage taken"), ("final_hp", "Final HP")):
+        if report[key]:
+            print(f"\n{title} per round:" if key != "final_hp" else f"\n{title}:")
+            for bucket, n in report[key].items():
+                print(f"  {int(bucket):>3}-{int(bucket) + BUCKET - 1:<3} {n:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate Starship Odyssey telemetry incrementally")
+    parser.add_argument("log", help="telemetry log written with --telemetry")
+    parser.add_argument("--state", help="aggregator state file (default: <log>.state.json)")
+    parser.add_argument("--follow", action="store_true", help="keep reading new events")
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between reads with --follow")
+    parser.add_argument("--json", action="store_true", help="print the totals as JSON")
+    args = parser.parse_args()
+
+    state = args.state or f"{args.log}.state.json"
+    aggregator = Aggregator.load(args.log, state)
+    try:
+        while True:
+            added = aggregator.update()
+            aggregator.save(state)
+            if added or not args.follow:
+                if args.json:
+                    json.dump(aggregator.report(), sys.stdout, indent=2)
+                    print()
+                else:
+                    print_report(aggregator.report())
+            if not args.follow:
+                return
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
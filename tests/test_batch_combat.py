@@ -0,0 +1,44 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from batch_combat import BatchCombat, policy_table, simulate
+from combat_solver import solve
+from engine import Combat, Engine
+
+FIGHTS = 2000
+
+
+@pytest.fixture(scope="module")
+def droid():
+    return Engine().scene("combat_droid").combat
+
+
+@pytest.mark.parametrize("policy", ["attack", "defend", "heal", "random"])
+def test_every_fight_is_won_lost_or_unfinished(droid, policy):
+    batch = BatchCombat(droid, FIGHTS, seed=1).run(policy, max_turns=50)
+    won, lost, active = batch.won, batch.lost, batch.active
+    assert int(won.sum()) + int(lost.sum()) + int(active.sum()) == FIGHTS
+    assert not (won & lost).any() and not (won & active).any() and not (lost & active).any()
+
+
+def test_unfinished_fights_are_not_wins(droid):
+    summary = BatchCombat(droid, FIGHTS, seed=1).run("heal", max_turns=50).summary()
+    assert summary["unfinished"] == FIGHTS
+    assert summary["win_rate"] == 0.0
+
+
+def test_simulate_rates_add_up(droid):
+    result = simulate(droid, FIGHTS, "heal", chunk=700, seed=2)
+    assert result["fights"] == FIGHTS
+    finished = (result["win_rate"] + result["loss_rate"]) * FIGHTS
+    assert round(finished) + result["unfinished"] == FIGHTS
+
+
+def test_optimal_policy_win_rate_matches_the_solver():
+    fight = Combat({"enemy": "Brute", "hp": 8, "attack": (1, 3), "strike": (2, 4), "defend": (1, 2),
+                    "heal": 2, "win": "won", "lose": "lost"})
+    solution = solve(fight, max_hp=10)
+    result = simulate(fight, 200000, policy_table(solution), seed=3, player_hp=10, max_hp=10)
+    assert result["win_rate"] == pytest.approx(solution.win_probability(10), abs=0.01)
+    assert result["win_rate"] + result["loss_rate"] == pytest.approx(1.0)
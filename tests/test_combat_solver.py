@@ -0,0 +1,67 @@
+import pytest
+
+from combat_solver import solve
+from engine import Combat, Engine
+
+SMALL = {"enemy": "Drone", "hp": 6, "attack": (1, 3), "strike": (1, 2), "defend": (0, 1), "heal": 2,
+         "win": "won", "lose": "lost"}
+MAX_HP = 7
+
+
+def reference(combat, max_hp, sweeps=5000):
+    """Plain value iteration over (player HP, enemy HP), straight from Engine.combat_turn's rules"""
+    rolls = lambda low_high: range(low_high[0], low_high[1] + 1)
+    win = {(h, d): 0.0 for h in range(max_hp + 1) for d in range(combat.hp + 1)}
+    for h in range(1, max_hp + 1):
+        win[h, 0] = 1.0
+
+    def struck(h, d, damage):
+        return sum(win[max(h - s, 0), d] for s in rolls(damage)) / len(rolls(damage))
+
+    def values(h, d):
+        attack = sum(1.0 if d - a <= 0 else struck(h, d - a, combat.strike)
+                     for a in rolls(combat.attack)) / len(rolls(combat.attack))
+        defend = struck(h, d, combat.defend)
+        heal = struck(min(h + combat.heal, max_hp), d, combat.strike)
+        return {"attack": attack, "defend": defend, "heal": heal}
+
+    for _ in range(sweeps):
+        for h in range(1, max_hp + 1):
+            for d in range(1, combat.hp + 1):
+                win[h, d] = max(values(h, d).values())
+    return win, values
+
+
+def test_win_probabilities_match_value_iteration():
+    combat = Combat(SMALL)
+    solution = solve(combat, MAX_HP)
+    win, values = reference(combat, MAX_HP)
+    for h in range(1, MAX_HP + 1):
+        for d in range(1, combat.hp + 1):
+            assert solution.win_probability(h, d) == pytest.approx(win[h, d], abs=1e-9)
+            # The recommended action is one that keeps the best chance
+            assert values(h, d)[solution.best_action(h, d)] == pytest.approx(win[h, d], abs=1e-9)
+
+
+def test_defeated_enemy_is_a_finished_fight():
+    solution = solve(Combat(SMALL), MAX_HP)
+    assert solution.win_probability(5, 0) == 1.0
+    assert solution.expected_turns(5, 0) == 0.0
+    assert solution.best_action(5, 0) is None
+    assert solution.best_action(5, -2) is None
+    assert solution.win_probability(0, 3) == 0.0
+
+
+def test_missing_hp_defaults_to_full_health():
+    solution = solve(Combat(SMALL), MAX_HP)
+    assert solution.win_probability() == solution.win_probability(MAX_HP, SMALL["hp"])
+
+
+def test_story_fights_are_monotonic_in_player_hp():
+    engine = Engine()
+    for scene in engine.scenes:
+        if scene.combat:
+            solution = solve(scene.combat)
+            chances = [solution.win_probability(h) for h in range(101)]
+            assert all(0.0 <= p <= 1.0 for p in chances)
+            assert chances == sorted(chances)
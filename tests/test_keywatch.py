@@ -0,0 +1,53 @@
+import io
+
+import pytest
+
+from typewriter import KeyWatch
+
+
+def typed(keys):
+    """KeyWatch with `keys` already typed ahead, and a list collecting the echo"""
+    watch = KeyWatch(io.StringIO())
+    watch._keep(keys)
+    echoed = []
+    return watch, echoed.append, echoed
+
+
+@pytest.mark.parametrize("keys, line", [
+    ("2\n", "2"),
+    ("2\x7f3\n", "3"),
+    ("12\b\b3\n", "3"),
+    ("\x7f\x7f1\n", "1"),
+    ("   2\n", "2"),  # spaces pressed to finish the text are dropped
+    ("Ann Lee\n", "Ann Lee"),
+    ("1\r2\r\n", "1"),
+])
+def test_type_ahead_goes_through_line_editing(keys, line):
+    watch, echo, echoed = typed(keys)
+    assert watch.read_line(echo) == line
+    assert echoed[-1] == "\n"
+
+
+def test_lines_are_read_one_at_a_time():
+    watch, echo, echoed = typed("1\n2\n")
+    assert watch.answered()
+    assert watch.read_line(echo) == "1"
+    assert watch.read_line(echo) == "2"
+    assert not watch.answered()
+
+
+def test_backspace_is_echoed_as_an_erase():
+    watch, echo, echoed = typed("ab\x7f\n")
+    watch.read_line(echo)
+    assert echoed == ["a", "b", "\b \b", "\n"]
+
+
+def test_eof_key_on_an_empty_line():
+    watch, echo, echoed = typed("\x04")
+    with pytest.raises(EOFError):
+        watch.read_line(echo)
+
+
+def test_eof_key_inside_a_line_is_ignored():
+    watch, echo, echoed = typed("1\x04\n")
+    assert watch.read_line(echo) == "1"
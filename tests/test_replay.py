@@ -0,0 +1,48 @@
+import io
+import json
+
+import pytest
+
+import replay
+import terminal_game
+
+# Name, then answers that go through the droid fight (combat rolls depend on the seed)
+ANSWERS = ["Ann", "1", "2", "1", "1", "1", "1", "1", "1", "1", "1", "1", "1", "1", "n"]
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    monkeypatch.setattr(terminal_game.typewriter, "mode", "instant")
+    monkeypatch.setattr(terminal_game.typewriter, "keys", terminal_game.typewriter.keys.__class__(io.StringIO()))
+    monkeypatch.setattr("sys.stdin", io.StringIO("\n".join(ANSWERS) + "\n"))
+    path = str(tmp_path / "session.json")
+    replay.record(path, seed=1234)
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_recording_replays_identically(session):
+    assert session["seed"] == 1234
+    assert session["inputs"][0] == "Ann"
+    assert session["player"]["name"] == "Ann"
+    assert replay.replay(session) == []
+
+
+def test_changed_input_is_reported(session):
+    session["inputs"][1] = "2"
+    problems = replay.replay(session)
+    assert any("transcript differs" in problem for problem in problems)
+
+
+def test_changed_seed_is_reported(session):
+    assert any(replay.replay(dict(session, seed=seed)) for seed in range(5))
+
+
+def test_unsupported_version(session):
+    assert replay.replay(dict(session, version=99)) == ["unsupported session version 99"]
+
+
+def test_replay_restores_the_typewriter_mode(session, monkeypatch):
+    monkeypatch.setattr(terminal_game.typewriter, "mode", "skip")
+    replay.replay(session)
+    assert terminal_game.typewriter.mode == "skip"
@@ -0,0 +1,110 @@
+import pytest
+
+import savegame
+from engine import Player
+from savegame import Journal, SaveError
+
+
+def player(name="Ann", hp=80, energy=35, inventory=("Power Cell",), crew=()):
+    p = Player(name)
+    p.hp, p.energy = hp, energy
+    p.inventory, p.crew_members = list(inventory), list(crew)
+    return p
+
+
+@pytest.mark.parametrize("value", [0, 1, 127, 128, 300, 2**31, 2**63 - 1])
+def test_varint_round_trip(value):
+    reader = savegame._Reader(savegame._varint(value))
+    assert reader.varint() == value and reader.done()
+
+
+@pytest.mark.parametrize("value", [0, 1, -1, 63, -64, 64, -65, 10**9, -10**9])
+def test_signed_round_trip(value):
+    assert savegame._Reader(savegame._signed(value)).signed() == value
+
+
+def test_snapshot_round_trip():
+    state = savegame.state_of(player(name="Zoë", hp=-5, crew=("Dr. Chen",)), "gateway_choice")
+    assert savegame.decode_snapshot(savegame.encode_snapshot(state)) == state
+
+
+@pytest.mark.parametrize("new", [
+    ("a", "Ann", 80, 100, 35, ("Power Cell",), ()),                       # unchanged
+    ("b", "Ann", 60, 100, 45, ("Power Cell", "Artifact"), ("Dr. Chen",)),  # appended
+    ("b", "Bo", 100, 120, 0, ("Artifact",), ()),                           # replaced
+])
+def test_delta_round_trip(new):
+    old = ("a", "Ann", 80, 100, 35, ("Power Cell",), ())
+    assert savegame.apply_delta(old, savegame.encode_delta(old, new)) == new
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "run.sav")
+    savegame.save(path, player(crew=("Dr. Chen",)), "ancient_artifact")
+    loaded, scene_id = savegame.load(path)
+    assert scene_id == "ancient_artifact"
+    assert savegame.state_of(loaded, scene_id) == savegame.state_of(player(crew=("Dr. Chen",)), scene_id)
+
+
+def journal_states(path, compact_every=64):
+    """Write a short run to a journal and return the state after every record"""
+    journal = Journal(path, compact_every)
+    p = player()
+    states = []
+    for step, scene_id in enumerate(["distress_signal", "investigate_ship", "call_out", "ancient_artifact"]):
+        p.hp -= 5 * step
+        if step == 2:
+            p.crew_members.append("Dr. Chen")
+        journal.record(p, scene_id)
+        states.append(savegame.state_of(p, scene_id))
+    return states
+
+
+def test_journal_resumes_the_latest_state(tmp_path):
+    path = str(tmp_path / "auto.sav")
+    states = journal_states(path)
+    assert savegame.read_state(path) == states[-1]
+    assert Journal(path).resume()[1] == "ancient_artifact"
+
+
+def test_journal_compacts_to_one_snapshot(tmp_path):
+    path = str(tmp_path / "auto.sav")
+    states = journal_states(path, compact_every=2)
+    records = list(savegame._records(open(path, "rb").read()))
+    assert records[0][0] == savegame.SNAPSHOT and len(records) <= 2
+    assert savegame.read_state(path) == states[-1]
+
+
+def test_torn_records_fall_back_to_the_last_intact_state(tmp_path):
+    path = str(tmp_path / "auto.sav")
+    states = journal_states(path)
+    data = open(path, "rb").read()
+    # Cut the file at every length past the first record: the state is always one of the written ones
+    first_end = 5 + len(savegame._record(savegame.SNAPSHOT, savegame.encode_snapshot(states[0])))
+    for cut in range(first_end, len(data) + 1):
+        with open(path, "wb") as f:
+            f.write(data[:cut])
+        assert savegame.read_state(path) in states
+    # A record cut short in the middle loses only that record
+    with open(path, "wb") as f:
+        f.write(data[:-1])
+    assert savegame.read_state(path) == states[-2]
+
+
+def test_corrupted_record_is_ignored(tmp_path):
+    path = str(tmp_path / "auto.sav")
+    states = journal_states(path)
+    data = bytearray(open(path, "rb").read())
+    data[-6] ^= 0xFF  # inside the last delta
+    with open(path, "wb") as f:
+        f.write(data)
+    assert savegame.read_state(path) == states[-2]
+
+
+def test_not_a_save(tmp_path):
+    path = str(tmp_path / "other.sav")
+    with open(path, "wb") as f:
+        f.write(b"PK\x03\x04 not a save")
+    with pytest.raises(SaveError):
+        savegame.load(path)
+    assert Journal(path).resume() is None
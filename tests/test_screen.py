@@ -0,0 +1,104 @@
+import io
+
+import pytest
+
+from engine import Player
+from screen import Screen
+
+pyte = pytest.importorskip("pyte")
+
+
+class Terminal:
+    """A Screen drawing into a pyte terminal emulator of the same size"""
+
+    def __init__(self, columns=40, rows=16):
+        self.out = io.StringIO()
+        self.screen = Screen(self.out, size=(columns, rows))
+        self.emulator = pyte.Screen(columns, rows)
+        self.stream = pyte.Stream(self.emulator)
+        self.sent = 0
+        self.screen.__enter__()
+
+    def resize(self, columns, rows):
+        self.screen.fixed_size = (columns, rows)
+        self.emulator.resize(rows, columns)
+        self.screen._resize()
+
+    def check(self):
+        """Feed everything sent so far to the emulator; it must show the Screen's grid"""
+        text = self.out.getvalue()
+        self.stream.feed(text[self.sent:])
+        self.sent = len(text)
+        assert self.emulator.display == self.screen._grid()
+
+
+def test_story_status_and_choices_render_as_laid_out():
+    terminal = Terminal()
+    screen = terminal.screen
+    player = Player("Ann")
+    screen.status(player)
+    terminal.check()
+    for i in range(30):  # enough to scroll the story pane several times over
+        screen.write(f"Line {i} of the story\n")
+        terminal.check()
+    screen.write("A line much longer than the forty columns of this terminal, wrapped over rows\n")
+    terminal.check()
+    player.hp = 7
+    player.inventory.append("Ancient Map")
+    screen.status(player)
+    screen.choices("What is your decision?", ["Attack", "Defend", "Heal"])
+    terminal.check()
+    screen.say("Please enter a valid number")
+    terminal.check()
+    screen.write("\nThe story moves on.\n")
+    terminal.check()
+
+
+def test_rows_ending_in_k_keep_the_cursor_in_place():
+    terminal = Terminal()
+    screen = terminal.screen
+    for name in ("AAAK", "AAAK!      tail", "OK", "AAAK!tail", "AAAK"):
+        screen.status(Player(name))
+        terminal.check()
+        screen.say(f"Captain {name}")
+        terminal.check()
+
+
+def test_scrolling_sends_line_feeds_instead_of_redrawing():
+    terminal = Terminal()
+    screen = terminal.screen
+    for i in range(20):
+        screen.write(f"Line {i}\n")
+    terminal.check()
+    before = screen.bytes
+    screen.write("One more line\n")
+    terminal.check()
+    assert screen.bytes - before < screen.columns * 2
+
+
+def test_resize_waits_for_the_next_render():
+    terminal = Terminal()
+    screen = terminal.screen
+    screen.write("Before the resize\n")
+    sent = len(terminal.out.getvalue())
+    terminal.resize(60, 20)
+    assert len(terminal.out.getvalue()) == sent
+    assert screen.columns == 40
+    screen.render()
+    assert screen.columns == 60
+    terminal.check()
+
+
+@pytest.mark.parametrize("columns", [40, 60, 45])
+def test_resize_rewraps_the_story(columns):
+    terminal = Terminal(50, 24)
+    screen = terminal.screen
+    line = " ".join(f"word{i}" for i in range(20))  # 118 characters
+    screen.write(line + "\nshort\n")
+    terminal.resize(columns, 24)
+    screen.render()
+    terminal.check()
+    rows = [line[i:i + columns] for i in range(0, len(line), columns)]
+    story = screen._grid()[screen.story_top:screen.story_top + screen.story_rows]
+    shown = [row.rstrip() for row in story if row.strip()]
+    assert shown == [row.rstrip() for row in rows] + ["short"]
@@ -0,0 +1,80 @@
+import heapq
+import math
+import random
+
+import pytest
+
+from engine import Engine, Player
+from sector import Sector, install
+
+
+@pytest.fixture(scope="module")
+def sector():
+    return Sector(400, seed=5)
+
+
+def dijkstra(sector, start):
+    """Shortest distances from start over brute-force jump lanes"""
+    systems = range(len(sector))
+    lanes = {a: [(sector.distance(a, b), b) for b in systems if b != a and sector.distance(a, b) <= sector.jump]
+             for a in systems}
+    best = {start: 0.0}
+    frontier = [(0.0, start)]
+    while frontier:
+        cost, system = heapq.heappop(frontier)
+        if cost > best[system]:
+            continue
+        for d, other in lanes[system]:
+            if cost + d < best.get(other, math.inf):
+                best[other] = cost + d
+                heapq.heappush(frontier, (cost + d, other))
+    return best
+
+
+def length(sector, path):
+    return sum(sector.distance(a, b) for a, b in zip(path, path[1:]))
+
+
+def test_routes_are_shortest(sector):
+    # Many goals and starts on one sector, so later searches run into cached routes
+    rng = random.Random(1)
+    for goal in rng.sample(range(len(sector)), 5):
+        shortest = dijkstra(sector, goal)  # lanes are symmetric: distances to goal
+        for start in rng.sample(range(len(sector)), 40):
+            path = sector.route(start, goal)
+            if start not in shortest:
+                assert path is None
+                continue
+            assert path[0] == start and path[-1] == goal
+            assert all(sector.distance(a, b) <= sector.jump for a, b in zip(path, path[1:]))
+            assert length(sector, path) == pytest.approx(shortest[start])
+
+
+def test_route_to_itself(sector):
+    assert sector.route(7, 7) == [7]
+
+
+def test_nearby_matches_brute_force(sector):
+    rng = random.Random(2)
+    for _ in range(50):
+        x, y = rng.uniform(-10, sector.size + 10), rng.uniform(-10, sector.size + 10)
+        radius = rng.uniform(0, sector.jump * 3)
+        expected = sorted((math.hypot(sector.xs[s] - x, sector.ys[s] - y), s) for s in range(len(sector)))
+        assert sector.nearby(x, y, radius) == [(d, s) for d, s in expected if d <= radius]
+        assert sector.nearest(x, y) == expected[0][1]
+
+
+def test_home_and_signal_are_connected(sector):
+    assert sector.route(sector.home, sector.signal) is not None
+
+
+def test_install_plots_the_course_to_the_signal():
+    sector = Sector(200, seed=3)
+    engine = install(Engine(), sector)
+    assert engine.detours == {f"sector:{sector.home}": "signal_source"}
+    engine.index()  # generated scenes count as the story scene they stand in for
+
+    scene, player = engine.scene(f"sector:{sector.home}"), Player("Ann")
+    for system in sector.route(sector.home, sector.signal)[1:]:
+        scene = engine.follow(scene, player, 1)
+        assert scene.id == ("signal_source" if system == sector.signal else f"sector:{system}")
@@ -0,0 +1,180 @@
+"""Memory-mapped story text packs
+
+Everything the player reads lives in one JSON file per language under
+text/ (text/en.json, text/fr.json, ...). Each is compiled into a pack:
+
+    header  = MAGIC VERSION index_offset index_length
+    body    = UTF-8 strings, back to back
+    index   = marshalled {key: (offset, length)}
+
+A pack is opened with mmap and only the index is read up front, so a
+session pages in just the text of the scenes it visits, and a language is
+not touched at all until something asks for it. Packs are rebuilt into
+__pycache__ whenever their JSON source is newer.
+
+Keys: "intro", "combat.<action>", "<scene>.text", "<scene>.prompt" and
+"<scene>.choices". Lists are stored joined with LINE, intro blocks with BLOCK.
+
+    python textpack.py build            # rebuild every language
+    python textpack.py check fr         # list keys fr is missing
+"""
+import marshal
+import mmap
+import os
+import struct
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+TEXT_DIR = os.path.join(ROOT, "text")
+PACK_DIR = os.path.join(ROOT, "__pycache__")
+DEFAULT = "en"
+
+MAGIC = b"SOTP"
+VERSION = 1
+HEADER = struct.Struct("<4sBQQ")
+LINE, BLOCK = "\x1f", "\x1e"
+
+
+class PackError(ValueError):
+    """Raised for files that are not valid text packs"""
+
+
+def entries(source):
+    """Flatten a language's JSON text into pack keys and strings"""
+    if "intro" in source:
+        yield "intro", BLOCK.join(LINE.join(block) for block in source["intro"])
+    for action, label in source.get("combat", {}).items():
+        yield f"combat.{action}", label
+    for scene_id, words in source.get("scenes", {}).items():
+        for field in ("text", "choices"):
+            if words.get(field):
+                yield f"{scene_id}.{field}", LINE.join(words[field])
+        if "prompt" in words:
+            yield f"{scene_id}.prompt", words["prompt"]
+
+
+def build(source_path, pack_path):
+    """Compile a JSON text file into a pack, atomically"""
+    import json  # only needed when a pack is (re)built
+    with open(source_path, encoding="utf-8") as f:
+        source = json.load(f)
+    body = bytearray()
+    index = {}
+    for key, text in entries(source):
+        data = text.encode("utf-8")
+        index[key] = (HEADER.size + len(body), len(data))
+        body += data
+    table = marshal.dumps(index)
+
+    os.makedirs(os.path.dirname(pack_path), exist_ok=True)
+    tmp = f"{pack_path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, HEADER.size + len(body), len(table)))
+        f.write(body)
+        f.write(table)
+    os.replace(tmp, pack_path)
+
+
+class TextPack:
+    """Read-only view of one pack; strings are decoded only when asked for"""
+
+    def __init__(self, path, language=None, fallback=None):
+        self.path = path
+        self.language = language
+        self.fallback = fallback  # language to ask for keys this pack lacks
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map.size() < HEADER.size:
+            raise PackError(f"{path}: truncated text pack")
+        magic, version, offset, length = HEADER.unpack_from(self.map)
+        if magic != MAGIC:
+            raise PackError(f"{path}: not a text pack")
+        if version != VERSION:
+            raise PackError(f"{path}: unsupported text pack version {version}")
+        self.index = marshal.loads(self.map[offset:offset + length])
+
+    def get(self, key, default=None):
+        entry = self.index.get(key)
+        if entry is None:
+            if self.fallback:
+                return load(self.fallback).get(key, default)
+            return default
+        offset, length = entry
+        return self.map[offset:offset + length].decode("utf-8")
+
+    def lines(self, key):
+        text = self.get(key)
+        return text.split(LINE) if text else []
+
+    def intro(self):
+        text = self.get("intro")
+        return [block.split(LINE) for block in text.split(BLOCK)] if text else []
+
+    def close(self):
+        self.map.close()
+
+
+_packs = {}
+
+
+def _pack_path(language):
+    return os.path.join(PACK_DIR, f"{language}.pack")
+
+
+def load(language=DEFAULT):
+    """Open a language's pack on first use, rebuilding it if its source changed"""
+    pack = _packs.get(language)
+    if pack is not None:
+        return pack
+    source = os.path.join(TEXT_DIR, f"{language}.json")
+    path = _pack_path(language)
+    try:
+        stale = not os.path.exists(path) or os.path.getmtime(source) > os.path.getmtime(path)
+    except OSError:  # no source: use a shipped pack as is
+        stale = False
+    if stale:
+        try:
+            build(source, path)
+        except OSError:  # read-only checkout
+            import tempfile
+            path = os.path.join(tempfile.gettempdir(), f"starship-odyssey-{language}.pack")
+            build(source, path)
+    try:
+        pack = TextPack(path, language, None if language == DEFAULT else DEFAULT)
+    except FileNotFoundError:
+        raise ValueError(f"No text for language {language!r}") from None
+    _packs[language] = pack
+    return pack
+
+
+def languages():
+    """Languages with a JSON source"""
+    return sorted(name[:-5] for name in os.listdir(TEXT_DIR) if name.endswith(".json"))
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Build and check Starship Odyssey text packs")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_cmd = sub.add_parser("build", help="compile text/<lang>.json into packs")
+    build_cmd.add_argument("languages", nargs="*", help="default: every language")
+    check_cmd = sub.add_parser("check", help="list keys a language lacks compared to English")
+    check_cmd.add_argument("language")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        for language in args.languages or languages():
+            build(os.path.join(TEXT_DIR, f"{language}.json"), _pack_path(language))
+            pack = load(language)
+            print(f"{language}: {len(pack.index)} strings, {os.path.getsize(pack.path)} bytes -> {pack.path}")
+        return
+
+    missing = sorted(set(load(DEFAULT).index) - set(load(args.language).index))
+    for key in missing:
+        print(key)
+    print(f"{args.language}: {len(missing)} key(s) missing", file=sys.stderr)
+    sys.exit(1 if missing else 0)
+
+
+if __name__ == "__main__":
+    main()
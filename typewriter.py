@@ -0,0 +1,237 @@
+"""Frame-paced typewriter renderer for the terminal
+
+Instead of writing, flushing and sleeping once per character, text goes out
+in frame-sized chunks: every frame writes all characters that are due
+against a monotonic clock and flushes once. The reveal speed stays the same
+in wall-clock time, flushes drop to one per frame, and a slow frame never
+makes the text fall behind.
+
+On an interactive terminal, keys are read between frames while text is
+being revealed. A keypress finishes the text being typed at once (space is
+the key to use when not typing an answer), and everything else typed is
+kept: answers typed ahead are handed to read_line() in order, and once a
+whole answer is waiting the text leading up to its question is shown
+without pacing.
+
+Modes:
+    typewriter - paced reveal; a keypress finishes the current text
+    instant    - write everything at once
+    skip       - paced reveal; a keypress finishes all text until the next question
+"""
+import io
+import os
+import sys
+import time
+
+try:
+    import termios
+    import tty
+    import select
+except ImportError:  # Windows
+    termios = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+MODES = ("typewriter", "instant", "skip")
+BACKSPACE = ("\x7f", "\b")
+EOF_KEY = "\x04"
+
+
+class KeyWatch:
+    """Non-blocking keypress check on an interactive stdin that keeps what was typed"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdin
+        self.saved = None
+        self.buffer = ""  # typed ahead and not yet read as a line; Enter is "\n"
+
+    def interactive(self):
+        try:
+            return self.stream.isatty()
+        except (AttributeError, ValueError):
+            return False
+
+    def __enter__(self):
+        if termios and self.interactive():
+            fd = self.stream.fileno()
+            self.saved = termios.tcgetattr(fd)
+            tty.setcbreak(fd, termios.TCSANOW)  # the default TCSAFLUSH would drop type-ahead
+        return self
+
+    def __exit__(self, *exc):
+        if self.saved is not None:
+            termios.tcsetattr(self.stream.fileno(), termios.TCSADRAIN, self.saved)
+            self.saved = None
+
+    def wait(self, timeout):
+        """Sleep up to `timeout` seconds; return True as soon as a key is pressed"""
+        if not self.interactive():
+            if timeout is not None:
+                time.sleep(timeout)
+            return False
+        if msvcrt:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while deadline is None or time.monotonic() < deadline:
+                if msvcrt.kbhit():
+                    self._keep(msvcrt.getwch())
+                    return True
+                time.sleep(0.01)
+            return False
+        ready, _, _ = select.select([self.stream], [], [], timeout)
+        if ready:
+            self._keep(os.read(self.stream.fileno(), 1024).decode("utf-8", "ignore"))
+            return True
+        return False
+
+    def poll(self):
+        """Keep any keys pressed since the last check; True if there were some"""
+        if not self.interactive():
+            return False
+        if msvcrt:
+            if not msvcrt.kbhit():
+                return False
+            keys = ""
+            while msvcrt.kbhit():
+                keys += msvcrt.getwch()
+            self._keep(keys)
+            return True
+        return self.wait(0)
+
+    def _keep(self, keys):
+        self.buffer += keys.replace("\r\n", "\n").replace("\r", "\n")
+
+    def answered(self):
+        """Whether a whole line has been typed ahead"""
+        return "\n" in self.buffer
+
+    def read_line(self, echo):
+        """Next line typed, starting with the type-ahead; echo(text) shows the typing
+
+        Keys typed ahead go through the same editing as keys typed now, so a
+        typo fixed with backspace while text was still revealing is fixed.
+        """
+        line = ""
+        while True:
+            if not self.buffer:
+                with self:
+                    while not self.buffer:
+                        self.wait(None)
+            key, self.buffer = self.buffer[0], self.buffer[1:]
+            if key == "\n":
+                break
+            if key in BACKSPACE:
+                if line:
+                    line = line[:-1]
+                    echo("\b \b")
+            elif key == EOF_KEY and not line:
+                raise EOFError
+            elif key == " " and not line:
+                continue  # spaces pressed only to finish the text are not part of the answer
+            elif key.isprintable():
+                line += key
+                echo(key)
+        echo("\n")
+        return line
+
+
+def _echo(text):
+    # Straight to the terminal, like the echo of input(): never part of a recorded transcript
+    sys.__stdout__.write(text)
+    sys.__stdout__.flush()
+
+
+class Typewriter:
+    """Writes text with a typewriter effect, one flush per frame"""
+
+    def __init__(self, stream=None, mode="typewriter", fps=12, clock=time.monotonic, sleep=time.sleep, keys=None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown typewriter mode: {mode}")
+        self.stream = stream
+        self.mode = mode
+        self.frame = 1 / fps
+        self.clock = clock
+        self.sleep = sleep
+        # Keypresses are read from the real stdin only when writing to the real stdout
+        self.keys = keys or KeyWatch(None if stream is None else io.StringIO())
+        self.skipping = False
+        self.flushes = 0
+
+    def out(self):
+        return self.stream or sys.stdout
+
+    def write(self, text):
+        out = self.out()
+        out.write(text)
+        out.flush()
+        self.flushes += 1
+
+    def type(self, text, delay=0.03):
+        """Reveal text at `delay` seconds per character"""
+        if not text:
+            return
+        if self.mode == "instant" or self.skipping or delay <= 0 or self.keys.answered():
+            self.write(text)
+            return
+        if self.keys.interactive():
+            with self.keys:
+                self._reveal(text, delay, self._key_wait)
+        else:
+            self._reveal(text, delay, self._pause)
+
+    def wait(self, seconds):
+        """Dramatic pause that a keypress (or an answer already typed) cuts short"""
+        if self.mode == "instant" or self.skipping or self.keys.answered():
+            return
+        if self.keys.interactive():
+            with self.keys:
+                if self._key_wait(seconds) and self.mode == "skip":
+                    self.skipping = True
+        else:
+            self.sleep(seconds)
+
+    def read_line(self, prompt=""):
+        """input() that first hands out answers typed ahead, validated by the caller as usual"""
+        if not self.keys.interactive():
+            return input(prompt)
+        self.write(prompt)
+        return self.keys.read_line(_echo)
+
+    def resume(self):
+        """Return to paced output after a skip, e.g. once the player is asked for input"""
+        self.skipping = False
+
+    def _pause(self, seconds):
+        self.sleep(seconds)
+        return False
+
+    def _key_wait(self, seconds):
+        """Sleep up to `seconds` on self.clock and self.sleep, checking for keys every frame;
+        True as soon as one is pressed"""
+        deadline = self.clock() + seconds
+        while not self.keys.poll():
+            left = deadline - self.clock()
+            if left <= 0:
+                return False
+            self.sleep(min(self.frame, left))
+        return True
+
+    def _reveal(self, text, delay, wait):
+        start = self.clock()
+        written = 0
+        total = len(text)
+        while written < total:
+            # The first character is due immediately, the rest every `delay` seconds
+            due = min(total, int((self.clock() - start) / delay) + 1)
+            if due > written:
+                self.write(text[written:due])
+                written = due
+            if written >= total:
+                break
+            next_due = start + written * delay
+            if wait(max(self.frame, next_due - self.clock())):
+                self.skipping = self.mode == "skip"
+                self.write(text[written:])
+                break